@@ -10,12 +10,18 @@ class RecManager(object):
         if RecManager.instantiated:
             raise Exception("DEV ERROR: RecManager already instantiated. Only one instance should ever be created")
 
+        self.reset()
+
+        RecManager.instantiated = True
+
+    def reset(self):
+        """
+        Forgets all constructed and active recorders.
+        """
         self.active_recorder: Recorder = None
         self.constructed_recorders: list[Recorder] = []
         self.recorder_stack: list[Recorder] = []
 
-        RecManager.instantiated = True
-
     def __repr__(self) -> str:
         active_recorder = self.active_recorder
         output_string = f"\nActive Recorder: {active_recorder}"
@@ -3,6 +3,7 @@ from rustworkx.visualization import graphviz_draw
 import numpy as np
 import csdl_alpha.utils.error_utils as error_utils
 from csdl_alpha.src.operations.loops.loop import Loop
+from csdl_alpha.src.graph.operation import Operation
 import sympy as sp
 from typing import Union
 
@@ -11,6 +12,11 @@ class Graph():
     def __init__(self, name = None):
         self.rxgraph = rx.PyDiGraph()
         self.node_table = {}
+        # operation and non-operation nodes of node_table (same indices, same order)
+        self._op_nodes = {}
+        self._var_nodes = {}
+        # incremented on every structural change so cached schedules of this graph can be invalidated
+        self._version = 0
         self.add_missing_variables = False
         if name is None:
             self.name = 'graph'
@@ -21,7 +27,26 @@ class Graph():
         if node in self.node_table:
             return
         index = self.rxgraph.add_node(node)
+        self._version += 1
         self.node_table[node] = index
+        if isinstance(node, Operation):
+            self._op_nodes[node] = index
+        else:
+            self._var_nodes[node] = index
+
+    def add_nodes(self, nodes):
+        new_nodes = []
+        for node in dict.fromkeys(nodes):
+            if node not in self.node_table:
+                new_nodes.append(node)
+        indices = self.rxgraph.add_nodes_from(new_nodes)
+        self._version += 1
+        for node, index in zip(new_nodes, indices):
+            self.node_table[node] = index
+            if isinstance(node, Operation):
+                self._op_nodes[node] = index
+            else:
+                self._var_nodes[node] = index
 
     def in_degree(self, node):
         return self.rxgraph.in_degree(self.node_table[node])
@@ -29,10 +54,25 @@ class Graph():
     def out_degree(self, node):
         return self.rxgraph.out_degree(self.node_table[node])
 
+    def _in_degree_map(self)->dict:
+        """
+        returns a dictionary mapping every node in the graph to its in degree
+        """
+        rxgraph = self.rxgraph
+        return {node:rxgraph.in_degree(index) for node, index in self.node_table.items()}
+
     def add_edge(self, node_from, node_to):
         from_ind = self.node_table[node_from]
         to_ind = self.node_table[node_to]
         self.rxgraph.add_edge(from_ind, to_ind, (from_ind, to_ind))
+        self._version += 1
+
+    def add_edges_from(self, edges:list[tuple]):
+        """
+        adds edges given as (from index, to index, payload) tuples
+        """
+        self.rxgraph.add_edges_from(edges)
+        self._version += 1
 
     def add_variable(self, variable):
         self.add_node(variable)
@@ -92,6 +132,18 @@ class Graph():
                 else:
                     node.set_inline_values()
 
+    def get_sorted_operations(self)->list:
+        """
+        returns the operations of the graph in the order execute_inline runs them
+        """
+        self.check_self()
+        sorted_operations = []
+        for node_index in rx.topological_sort(self.rxgraph):
+            node = self.rxgraph[node_index]
+            if is_operation(node):
+                sorted_operations.append(node)
+        return sorted_operations
+
     def update_downstream(self, node):
         descendants = rx.descendants(self.rxgraph, self.node_table[node])
         self.execute_inline(subset = descendants)
@@ -206,12 +258,22 @@ class Graph():
         Deletes nodes from the graph
         """
         from csdl_alpha.src.graph.node import Node
-        for node_index in nodes:
+        # rustworkx keeps the indices of the remaining nodes when removing nodes,
+        # so the node table is updated in place instead of being rebuilt
+        node_table = self.node_table
+        self._version += 1
+        for node_index in dict.fromkeys(nodes):
             if isinstance(node_index, Node):
-                node_index = self.node_table[node_index]
+                node = node_index
+                node_index = node_table[node]
+            else:
+                node = self.rxgraph[node_index]
             self.rxgraph.remove_node(node_index)
-
-        self.update_node_table()
+            del node_table[node]
+            if isinstance(node, Operation):
+                del self._op_nodes[node]
+            else:
+                del self._var_nodes[node]
 
     def _replace_node(self, old_node, new_node):
         """
@@ -222,6 +284,7 @@ class Graph():
         self._delete_nodes([new_node]) #NOTE: this is kinda dumb
         old_node_index = self.node_table[old_node]
         self.rxgraph[old_node_index] = new_node
+        self._version += 1
         self.update_node_table()
         # TODO: update operations to refer to new node?
         for operation in self.rxgraph.successors(old_node_index):
@@ -259,9 +322,16 @@ class Graph():
         Update the node table with the rustworkx graph
         """
         self.node_table = {}
+        self._op_nodes = {}
+        self._var_nodes = {}
+        self._version += 1
         for index in self.rxgraph.node_indices():
             node = self.rxgraph[index]
             self.node_table[node] = index
+            if isinstance(node, Operation):
+                self._op_nodes[node] = index
+            else:
+                self._var_nodes[node] = index
 
         self.check_self()
 
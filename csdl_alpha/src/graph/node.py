@@ -10,6 +10,9 @@ class Node(object):
     """
     # __slots__ = "recorder", "namespace", "trace", "hierarchy", "is_input", "is_implicit", "save", "names", "name", "value", "shape", "size", "tags"
 
+    # class-level type flag so hot recorder paths don't need to import Variable for isinstance checks
+    _is_variable = False
+
     def __init__(self) -> None:
         from csdl_alpha.src.recorder import Namespace
         self.namespace: Namespace = None
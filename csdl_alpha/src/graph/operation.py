@@ -78,11 +78,7 @@ class Operation(Node):
     
     def _add_to_graph(self):
         self.recorder._add_node(self)
-        for input_variable in self.inputs:
-            self.recorder._add_edge(input_variable, self)
-
-        for output_var in self.outputs:
-            self.recorder._add_edge(self, output_var)
+        self.recorder._add_operation_edges(self)
 
     def set_inline_values(self):
         # DOESNT WORK
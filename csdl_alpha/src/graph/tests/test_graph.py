@@ -0,0 +1,25 @@
+import csdl_alpha.utils.testing_utils as csdl_tests
+
+class TestGraph(csdl_tests.CSDLTest):
+    def test_version(self):
+        self.prep()
+        import csdl_alpha as csdl
+
+        graph = csdl.get_current_recorder().active_graph
+        x = csdl.Variable(name='x', value=2.0)
+        version = graph._version
+        y = x*2.0
+        assert graph._version > version
+
+        # replacing a node keeps the node and edge counts but is still a structural change
+        num_nodes, num_edges = graph.rxgraph.num_nodes(), graph.rxgraph.num_edges()
+        z = csdl.Variable(name='z', value=3.0)
+        version = graph._version
+        graph._replace_node(x, z)
+        assert graph.rxgraph.num_nodes() == num_nodes
+        assert graph.rxgraph.num_edges() == num_edges
+        assert graph._version > version
+
+        version = graph._version
+        graph._delete_nodes([y])
+        assert graph._version > version
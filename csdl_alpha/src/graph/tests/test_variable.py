@@ -22,6 +22,32 @@ class TestVariable(csdl_tests.CSDLTest):
         assert isinstance(a.value[0], np.float64)
         assert isinstance(b.value[0], np.float64)
 
+    def test_from_scalar(self):
+        self.prep()
+        import csdl_alpha as csdl
+        import numpy as np
+        from csdl_alpha.src.graph.variable import Constant
+
+        a = csdl.Variable(value=2.0, name='a')
+        b = csdl.Variable.from_scalar(2, name='b')
+        assert b.shape == a.shape
+        assert b.size == a.size
+        assert b.names == ['b']
+        assert b.tags == []
+        assert b.namespace is a.namespace
+        assert b.value.dtype == np.float64
+        assert np.all(a.value == b.value)
+        assert b in csdl.get_current_recorder().active_graph.node_table
+
+        c = Constant.from_scalar(3)
+        assert type(c) is Constant
+        assert c.value[0] == 3.0
+
+        # subclasses with their own __init__ cannot skip it
+        from csdl_alpha.src.operations.loops.loop import IterationVariable
+        with pytest.raises(TypeError):
+            IterationVariable.from_scalar(1.0)
+
     def test_np_matrix_convert(self):
         self.prep()
         import csdl_alpha as csdl
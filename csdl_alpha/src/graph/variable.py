@@ -3,9 +3,12 @@ import numpy as np
 from typing import Union
 from csdl_alpha.utils.inputs import ingest_value, get_shape, process_shape_and_value, get_type_string
 
+_SCALAR_SHAPE = (1,)
+
 class Variable(Node):
     __array_priority__ = 1000
     dtype = np.float64
+    _is_variable = True
     def __init__(
         self,
         shape: tuple = None, 
@@ -48,22 +51,29 @@ class Variable(Node):
         
         self.hierarchy = hierarchy
         super().__init__()
+
+        shape, value = process_shape_and_value(shape, value)
+        if len(shape) == 0:
+            raise ValueError("Shape must have at least one dimension")
+        if len(shape) == 1:
+            size = shape[0]
+        else:
+            size = np.prod(shape)
+        self._initialize(shape, value, size, name, tags)
+
+    def _initialize(self, shape:tuple, value:np.ndarray, size:int, name:str, tags:list[str]):
+        """
+        adds the variable to the active graph and sets its (already processed) shape, value and metadata
+        """
         self.recorder._add_node(self)
 
         self._save = False
         self.names = []
         self.name = None
 
-        shape, value = process_shape_and_value(shape, value)
         self.value = value
         self.shape = shape
-        
-        if len(shape) == 0:
-            raise ValueError("Shape must have at least one dimension")
-        if len(shape) == 1:
-            self.size = shape[0]
-        else:
-            self.size = np.prod(shape)
+        self.size = size
         if name is not None:
             self.add_name(name)
 
@@ -73,7 +83,26 @@ class Variable(Node):
             self.tags = tags
 
         self.post_init()
-    
+
+    @classmethod
+    def from_scalar(cls, value: Union[float, int], name: str = None):
+        """
+        Builds a variable of shape (1,) from a Python float or int.
+
+        Equivalent to cls(value = value, name = name) but skips the generic value and shape processing.
+        Only available for classes that use Variable.__init__.
+        """
+        if cls.__init__ is not Variable.__init__:
+            raise TypeError(f"{cls.__name__} overrides __init__ and cannot be built with from_scalar")
+        variable = cls.__new__(cls)
+        variable.hierarchy = None
+        Node.__init__(variable)
+
+        array = np.empty(1, dtype=cls.dtype)
+        array[0] = value
+        variable._initialize(_SCALAR_SHAPE, array, 1, name, None)
+        return variable
+
     def post_init(self):
         pass
 
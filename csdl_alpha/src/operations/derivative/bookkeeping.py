@@ -61,6 +61,9 @@ class VarTangents():
         """
         self.tangent_dictionary:dict[Variable: Variable] = {}
 
+        # derivative factors built by evaluate_vjp methods, only shared within one derivative build
+        self.vjp_factors:dict = {}
+
     def accumulate(self, variable:Variable, tangent:Variable)->None:
         """Accumulate a tangent for a variable.
 
@@ -46,15 +46,19 @@ def reverse(
         if loop:
             # Assume derivatives do not stack by default. Possible make this an option in the future.
             loop_d = csdl.frange(of_var.size, inline_lazy_stack=True)
+            # every loop iteration must record its own operations
+            vjp_factors = None
         else:
             loop_d = range(of_var.size)
+            # the rows are recorded one after the other so they can share derivative factors
+            vjp_factors = {}
         for row_index in loop_d:
             current_output_seed = initial_output_seed.set(csdl.slice[row_index], 1.0)
             current_output_seed = current_output_seed.reshape(of_var.shape)
 
             #TODO: pass in node order first somehow. Right now, we are 
             # vjp_cotangents = vjp([(of_var,current_output_seed)], wrt_vars, graph)
-            vjp_cotangents = _vjp([(of_var,current_output_seed)], wrt_vars, node_order)
+            vjp_cotangents = _vjp([(of_var,current_output_seed)], wrt_vars, node_order, vjp_factors)
 
             for wrt_var in wrt_vars:
                 wrt_cotangent = vjp_cotangents[wrt_var]
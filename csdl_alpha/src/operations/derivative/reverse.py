@@ -57,6 +57,7 @@ def vjp(seeds:list[tuple[Variable, Variable]],
 def _vjp(seeds:list[tuple[Variable, Variable]],
         wrt_vars:Union[Variable, list[Variable]],
         node_order:list[Union[Variable,Operation]],
+        vjp_factors:dict = None,
     )->dict[Variable]:
     """ Computes the vector-Jacobian product of the seeds with respect to the wrts in the graph.
 
@@ -68,6 +69,8 @@ def _vjp(seeds:list[tuple[Variable, Variable]],
         A list of variables to propagate derivatives through
     graph : Graph
         The graph in which to compute the derivatives
+    vjp_factors : dict, optional
+        Derivative factors to share with other vector-Jacobian products of the same derivative build
 
     Returns
     -------
@@ -85,6 +88,8 @@ def _vjp(seeds:list[tuple[Variable, Variable]],
     import csdl_alpha as csdl
 
     cotangents = VarTangents()
+    if vjp_factors is not None:
+        cotangents.vjp_factors = vjp_factors
     for of_var, seed in seeds:
         cotangents.initialize(of_var)
         cotangents.accumulate(of_var, variablize(seed))
@@ -3,6 +3,7 @@ from csdl_alpha.src.graph.graph import Graph, is_variable
 from csdl_alpha.utils.printing import print_tabularized
 
 import numpy as np
+from functools import lru_cache
 
 def verify_derivatives_inline(
         ofs:list[Variable],
@@ -150,9 +151,11 @@ def finite_difference_inline(
     """
     # Store original values for the outputs and input
     finite_differenced_values = {}
+    original_flat_values = {}
     for of in ofs:
         finite_differenced_values[of] = {}
         finite_differenced_values[of]['original_value'] = of.value.copy()
+        original_flat_values[of] = finite_differenced_values[of]['original_value'].ravel()
         finite_differenced_values[of]['jacobian'] = np.zeros((of.size, wrt.size))
 
     original_wrt_value = wrt.value
@@ -167,8 +170,8 @@ def finite_difference_inline(
 
         # compute the output values
         for of in ofs:
-            fx_plus_h = of.value.flatten()
-            fx = finite_differenced_values[of]['original_value'].flatten()
+            fx_plus_h = of.value.ravel()
+            fx = original_flat_values[of]
             h = tolerance
             finite_differenced_values[of]['jacobian'][:, col_index] = (fx_plus_h - fx) / h
 
@@ -186,13 +189,24 @@ def get_uncontract_action(
     """
     For vector-jacobianing, expand the given vjp back to an input shape.
     """
+    return _build_uncontract_action(len(expand_to_shape), tuple(contraction_axes))
+
+@lru_cache(maxsize=256)
+def _build_uncontract_action(
+        rank:int,
+        contraction_axes:tuple[int],
+        )->str:
+    """
+    Builds the action string for get_uncontract_action.
+    Only depends on the rank and the contraction axes so it is cached.
+    """
     alphabet = 'abcdefghijklmnopqrstuvwxyz'
     action = ''
-    for i in range(len(expand_to_shape)):
+    for i in range(rank):
         if i in contraction_axes:
             continue
         action += alphabet[i]
     action += '->'
-    for i in range(len(expand_to_shape)):
+    for i in range(rank):
         action += alphabet[i]
     return action
\ No newline at end of file
@@ -2,7 +2,6 @@ from csdl_alpha.src.operations.implicit_operations.nonlinear_solvers.nonlinear_s
 from csdl_alpha.src.graph.variable import Variable
 from csdl_alpha.utils.typing import VariableLike
 import numpy as np
-import math
 
 from typing import Union
 
@@ -43,6 +42,11 @@ class BracketedSearch(NonlinearSolver):
         self.add_metadata('tolerance', tolerance)
         self.add_metadata('max_iter', max_iter)
 
+        # flattened (x_lower, x_upper, tolerance) vectors, kept only when they are all constants
+        self._cached_vectors = None
+        # layout of the states in the assembled vector, see _build_layout
+        self._layout = None
+
     def add_state(
             self,
             state: Variable,
@@ -95,87 +99,183 @@ class BracketedSearch(NonlinearSolver):
 
         # check if tolerance is valid and store it
         self.add_tolerance(state, tolerance)
+        self._cached_vectors = None
+        self._layout = None
 
-    def _inline_solve_(self):
-        iter = 0
+    def _build_layout(self)->tuple[list, list, list, list[int], list[int], list[int], int]:
+        """Computes where each state lives in the assembled vector.
+
+        Returns
+        -------
+        tuple
+            states, residuals, shapes, sizes, start offsets, stop offsets and the total size
+        """
+        states = list(self.state_to_residual_map.keys())
+        residuals = [self.state_to_residual_map[state] for state in states]
+        shapes = [state.shape for state in states]
+        sizes = np.array([state.size for state in states], dtype=np.intp)
+        offsets = np.zeros(len(states), dtype=np.intp)
+        np.cumsum(sizes[:-1], out=offsets[1:])
+        size = int(sizes.sum())
+        return states, residuals, shapes, sizes.tolist(), offsets.tolist(), (offsets + sizes).tolist(), size
+
+    def _prepare_vectors(
+            self,
+            states:list[Variable],
+            sizes:list[int],
+        )->tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Assembles the flat lower bracket, upper bracket and tolerance vectors for all states.
+
+        The vectors are cached if none of the brackets or tolerances are CSDL variables
+        as they cannot change between solves. The bracket vectors returned are always
+        fresh copies because the solver updates them in place.
+        """
+        if self._cached_vectors is not None:
+            x_lower, x_upper, tolerance = self._cached_vectors
+            return x_lower.copy(), x_upper.copy(), tolerance
+
+        def to_flat_array(x, size):
+            if isinstance(x, Variable):
+                x = x.value
+            return np.broadcast_to(np.asarray(x, dtype=np.float64).reshape(-1), (size,))
+
+        # bracket indices could be Variable or ndarray of shape (1,) or state.shape
+        # or float or int
+        lower_list = []
+        upper_list = []
+        tolerance_list = []
+        is_constant = True
+        for state, state_size in zip(states, sizes):
+            bracket = self.state_metadata[state]['bracket']
+            ith_tolerance = self.state_metadata[state]['tolerance']
+
+            lower_list.append(to_flat_array(bracket[0], state_size))
+            upper_list.append(to_flat_array(bracket[1], state_size))
+            tolerance_list.append(to_flat_array(ith_tolerance, state_size))
+            for x in (bracket[0], bracket[1], ith_tolerance):
+                if isinstance(x, Variable):
+                    is_constant = False
+
+        x_lower = np.concatenate(lower_list)
+        x_upper = np.concatenate(upper_list)
+        tolerance = np.concatenate(tolerance_list)
+        if is_constant:
+            self._cached_vectors = (x_lower.copy(), x_upper.copy(), tolerance)
+        return x_lower, x_upper, tolerance
 
+    def _inline_solve_(self):
         # I'm going to assemble everything into a big vector, solve it, and then unpack it
 
-        # First, I need to know the size of the vector, and the indices of each state
-        indices_dict = {}
-        size = 0
-        for state in self.state_to_residual_map.keys():
-            state_size = math.prod(state.shape)
-            indices_dict[state] = slice(size, size+state_size)
-            size += state_size
+        # First, I need to know the size of the vector, and the offset of each state in it
+        # This does not change between solves so it is only computed once
+        if self._layout is None:
+            self._layout = self._build_layout()
+        states, residuals, shapes, sizes, starts, stops, size = self._layout
 
-        x_upper = np.empty(size)
-        x_lower = np.empty(size)
         r_lower = np.empty(size)
-        r_update = np.empty(size)
-        tolerance = np.empty(size)
-
-        def compute(x, r):
-            for state, index in indices_dict.items():
-                state.value = x[index].reshape(state.shape)
-            self.update_residual()
-            for state, index in indices_dict.items():
-                r[index] = self.state_to_residual_map[state].value.flatten()
 
-        def to_array(x):
-            if isinstance(x, Variable):
-                return x.value
-            elif isinstance(x, np.ndarray):
-                return x
-            elif isinstance(x, (float, int)):
-                return np.array([x])
+        if len(states) == 1:
+            # a single state spans the whole vector so no slicing or assembly is needed
+            state, residual, shape = states[0], residuals[0], shapes[0]
+            def compute(x, r):
+                state.value = x.reshape(shape)
+                self.update_residual()
+                np.copyto(r.reshape(shape), residual.value)
+        else:
+            def compute(x, r):
+                for state, start, stop, shape in zip(states, starts, stops, shapes):
+                    state.value = x[start:stop].reshape(shape)
+                self.update_residual()
+                # axis=None copies each residual flat into r directly, so non-contiguous residual values
+                # are never copied into an intermediate flattened array first
+                np.concatenate([residual.value for residual in residuals], axis=None, out=r)
 
         # Now, I need to populate the x vectors with the initial bracket values
         # and populate the tolerance vector
-        for state in self.state_to_residual_map.keys():
-            bracket = self.state_metadata[state]['bracket']
-            ith_tolerance = self.state_metadata[state]['tolerance']
-            # bracket indices could be Variable or ndarray of shape (1,) or state.shape
-            # or float or int
-            # I want to turn them all into numpy arrays
-            
-            # now I can flatten them and put them in the x vectors
-            x_lower[indices_dict[state]] = to_array(bracket[0]).flatten()
-            x_upper[indices_dict[state]] = to_array(bracket[1]).flatten()
-            tolerance[indices_dict[state]] = to_array(ith_tolerance).flatten()
+        x_lower, x_upper, tolerance = self._prepare_vectors(states, sizes)
+
+        # a single tolerance for every entry (the common case) allows a cheaper convergence check
+        if np.all(tolerance == tolerance[0]):
+            uniform_tolerance = float(tolerance[0])
+        else:
+            uniform_tolerance = None
 
         # Now, I need to populate the r vectors with the residuals of the initial bracket values
         # I'm also going to record whether the sign of the lower is negative (True) or positive (False)
         compute(x_lower, r_lower)
         # compute(x_upper, r_upper)
-        r_sign = r_lower < 0
+        r_sign = np.signbit(r_lower)
+
+        # work buffers are allocated once and updated in place every iteration
+        x_mid = np.empty(size)
+        lower_mask = np.empty(size, dtype=bool)
+        upper_mask = np.empty(size, dtype=bool)
+        if self.elementwise_states:
+            converged_mask = np.empty(size, dtype=bool)
+
+        # the lower bracket may already satisfy the tolerance, in which case no midpoints are evaluated
+        converged = check_run_time_tolerance(r_lower, tolerance)
+        num_evaluations = 0 if converged else self.metadata['max_iter'] + 1
 
-        # Now, I need to iterate until the bracket is small enough
-        while True:
+        # only the signs of the lower residuals are needed from here on, so their buffer is reused
+        r_update = r_lower
+
+        # Now, I need to iterate until the bracket is small enough or the midpoint evaluations run out
+        iter = 0
+        for iter in range(num_evaluations):
             # compute the midpoint
-            x_mid = (x_upper + x_lower) / 2
+            _bisect_midpoint(x_lower, x_upper, x_mid)
             compute(x_mid, r_update)
 
             # check if the midpoint is the new upper or lower bound
-            lower_mask = (r_update < 0) == r_sign
-
-            x_lower[lower_mask] = x_mid[lower_mask]
-            x_upper[~lower_mask] = x_mid[~lower_mask]
+            _residual_sign_matches(r_update, r_sign, lower_mask)
+            _update_brackets(x_lower, x_upper, x_mid, lower_mask, upper_mask)
 
             # check if the bracket is small enough
-            if check_run_time_tolerance(r_update, tolerance):
-                converged = True
-                break
-
-            # check if we've hit the max iterations
-            iter += 1
-            if iter > self.metadata['max_iter']:
-                converged = False
+            if self.elementwise_states:
+                # each residual entry only depends on its own state entry, so entries that have
+                # converged are frozen at their midpoint by collapsing their bracket onto it
+                np.less_equal(np.abs(r_update), tolerance, out=converged_mask)
+                np.copyto(x_lower, x_mid, where=converged_mask)
+                np.copyto(x_upper, x_mid, where=converged_mask)
+                converged = bool(converged_mask.all())
+            elif uniform_tolerance is not None:
+                converged = bool(np.abs(r_update).max() <= uniform_tolerance)
+            else:
+                converged = check_run_time_tolerance(r_update, tolerance)
+            if converged:
                 break
+        else:
+            iter = num_evaluations
 
         if self.print_status:
             print(self._inline_print_nl_status(iter, converged))
 
 
-        
 
+
+def _bisect_midpoint(x_lower:np.ndarray, x_upper:np.ndarray, x_mid:np.ndarray):
+    """Writes the midpoint of the bracket into x_mid without allocating.
+    """
+    np.add(x_upper, x_lower, out=x_mid)
+    np.multiply(x_mid, 0.5, out=x_mid)
+
+def _residual_sign_matches(r_update:np.ndarray, r_sign:np.ndarray, out:np.ndarray):
+    """Sets out to True where the sign bit of r_update matches r_sign, reusing out as scratch.
+    """
+    np.signbit(r_update, out=out)
+    np.equal(out, r_sign, out=out)
+
+def _update_brackets(
+        x_lower:np.ndarray,
+        x_upper:np.ndarray,
+        x_mid:np.ndarray,
+        lower_mask:np.ndarray,
+        upper_mask:np.ndarray,
+    ):
+    """Moves the lower bracket to x_mid where lower_mask is True and the upper bracket elsewhere (in place).
+    upper_mask is scratch space for the negated mask.
+    """
+    np.logical_not(lower_mask, out=upper_mask)
+    np.copyto(x_lower, x_mid, where=lower_mask)
+    np.copyto(x_upper, x_mid, where=upper_mask)
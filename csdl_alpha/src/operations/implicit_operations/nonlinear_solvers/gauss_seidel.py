@@ -36,6 +36,10 @@ class GaussSeidel(FixedPoint):
             residual_jac_kwargs = residual_jac_kwargs,
         )
 
+        # precomputed per-state update steps, see _get_update_sequence
+        self._update_sequence = None
+        self._update_sequence_key = None
+
     def add_state(
             self,
             state: Variable,
@@ -87,22 +91,42 @@ class GaussSeidel(FixedPoint):
         # Check if user provided a tolerance
         self.add_tolerance(state, tolerance)
 
+    def _get_update_sequence(self)->list[tuple[Variable, Variable, Variable, set[int]]]:
+        """
+        Returns (state, residual, state_update, subset) for each state in update order where
+        subset holds the residual graph node indices to re-evaluate before updating that state
+        (None for a full evaluation).
+        Rebuilt only if the residual graph has changed since the last call.
+        """
+        residual_graph = self.residual_graph
+        key = (residual_graph, residual_graph._version)
+        if self._update_sequence is None or self._update_sequence_key != key:
+            import rustworkx as rx
+            rxgraph = residual_graph.rxgraph
+            node_table = residual_graph.node_table
+            self._update_sequence = []
+            subset = None
+            for state, residual in self.state_to_residual_map.items():
+                state_update = self.state_metadata[state]['state_update']
+                self._update_sequence.append((state, residual, state_update, subset))
+                # only operations that depend on this state change after it is updated
+                subset = rx.descendants(rxgraph, node_table[state])
+            self._update_sequence_key = key
+        return self._update_sequence
+
     def _inline_update_states(self):
         # while not converged:
         #    x0_new = x0_state_update(x0_old, x1_old, ... xn_old)
         #    x1_new = x1_state_update(x0_new, x1_old, ... xn_old)
         #    ...
         #    xn_new = xn_state_update(x0_new, x1_new, ... xn_old)
-        for current_state, current_residual in self.state_to_residual_map.items():
+        for current_state, current_residual, state_update, subset in self._get_update_sequence():
             # compute residuals
-            self.update_residual()
-
-            # get current state value and residual value
-            current_state_value = current_state.value
-            current_residual_value = current_residual.value
+            # after the first state, only the operations that depend on the previously updated state are re-evaluated
+            self.update_residual(subset = subset)
 
             # update current state value
-            if self.state_metadata[current_state]['state_update'] is None:
-                current_state.value = current_state_value - current_residual_value
+            if state_update is None:
+                current_state.value = current_state.value - current_residual.value
             else:
-                current_state.value = self.state_metadata[current_state]['state_update'].value
+                current_state.value = state_update.value
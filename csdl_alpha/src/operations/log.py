@@ -15,7 +15,7 @@ class Log(ElementwiseOperation):
         self.name = 'log'
 
     def compute_inline(self, x, y):
-        return np.log(x) / np.log(y)
+        return _inline_log(x, y)
 
     # def evaluate_jacobian(self, x, y):
     #     return 1 / (x * log(y)),  - log(x) / (y * (log(y))**2)
@@ -29,10 +29,28 @@ class Log(ElementwiseOperation):
     def evaluate_vjp(self, cotangents, x, y, z):
         import csdl_alpha as csdl
         vout = cotangents[z]
+        # log(y) is shared by both partials and log(x)/log(y)**2 is recovered from the output z
+        ly = csdl.log(y)
         if cotangents.check(x):
-            cotangents.accumulate(x, vout / (x * csdl.log(y)))
+            cotangents.accumulate(x, vout / (x * ly))
         if cotangents.check(y):
-            cotangents.accumulate(y, -vout * csdl.log(x) / (y * (csdl.log(y))**2))
+            cotangents.accumulate(y, -vout * z / (y * ly))
+
+class NaturalLog(ElementwiseOperation):
+    '''
+    Elementwise natural logarithm of a tensor.
+    '''
+
+    def __init__(self,x):
+        super().__init__(x)
+        self.name = 'natural_log'
+
+    def compute_inline(self, x):
+        return np.log(x)
+
+    def evaluate_vjp(self, cotangents, x, y):
+        if cotangents.check(x):
+            cotangents.accumulate(x, cotangents[y] / x)
 
 # We need a broadcast log even when the methods are exactly the same because Broadcast cannot inherit from ElementwiseOperation
 # TODO: Avoid code duplication
@@ -48,7 +66,7 @@ class LeftBroadcastLog(Operation):
         self.set_dense_outputs(out_shapes)
 
     def compute_inline(self, x, y):
-        return np.log(x) / np.log(y)
+        return _inline_log(x, y)
 
     # def evaluate_jacobian(self, x, y):
     #     return 1 / (x * log(y)),  - log(x) / (y * (log(y))**2)
@@ -62,10 +80,12 @@ class LeftBroadcastLog(Operation):
     def evaluate_vjp(self, cotangents, x, y, z):
         import csdl_alpha as csdl
         vout = cotangents[z]
+        # log(y) is shared by both partials and log(x)/log(y)**2 is recovered from the output z
+        ly = csdl.log(y)
         if cotangents.check(x):
-            cotangents.accumulate(x, csdl.sum(vout / (x * csdl.log(y))))
+            cotangents.accumulate(x, csdl.sum(vout / (x * ly)))
         if cotangents.check(y):
-            cotangents.accumulate(y, -vout * csdl.log(x) / (y * (csdl.log(y))**2))
+            cotangents.accumulate(y, -vout * z / (y * ly))
 
 class RightBroadcastLog(Operation):
     '''
@@ -79,7 +99,7 @@ class RightBroadcastLog(Operation):
         self.set_dense_outputs(out_shapes)
 
     def compute_inline(self, x, y):
-        return np.log(x) / np.log(y)
+        return _inline_log(x, y)
 
     # def evaluate_jacobian(self, x, y):
     #     return 1 / (x * log(y)),  - log(x) / (y * (log(y))**2)
@@ -93,10 +113,28 @@ class RightBroadcastLog(Operation):
     def evaluate_vjp(self, cotangents, x, y, z):
         import csdl_alpha as csdl
         vout = cotangents[z]
+        # log(y) is shared by both partials and log(x)/log(y)**2 is recovered from the output z
+        ly = csdl.log(y)
         if cotangents.check(x):
-            cotangents.accumulate(x, vout / (x * csdl.log(y)))
+            cotangents.accumulate(x, vout / (x * ly))
         if cotangents.check(y):
-            cotangents.accumulate(y, - csdl.sum(vout *csdl.log(x) / (y * (csdl.log(y))**2)))
+            cotangents.accumulate(y, - csdl.sum(vout * z / (y * ly)))
+
+def _inline_log(x:np.ndarray, y:np.ndarray)->np.ndarray:
+    '''
+    Computes log(x)/log(y) reusing the buffer of the larger logarithm for the result.
+    A scalar base is applied as a single multiplication by 1/log(y).
+    '''
+    if y.size == 1:
+        out = np.log(x)
+        out *= 1.0/np.log(y.reshape(-1)[0])
+    elif x.size == y.size:
+        out = np.log(x)
+        out /= np.log(y)
+    else:
+        out = np.log(y)
+        np.divide(np.log(x), out, out=out)
+    return out
 
 def log(x, base=None):
     '''
@@ -143,20 +181,35 @@ def log(x, base=None):
 
     x = validate_and_variablize(x)
     if base is None:
-        y = validate_and_variablize(np.e)
-    else:
-        y = validate_and_variablize(base)
-
+        return NaturalLog(x).finalize_and_return_outputs()
+    elif isinstance(base, (float, int, np.floating, np.integer)) and not isinstance(base, bool):
+        # a constant base is folded into a single scaling of the natural logarithm
+        # (computed in double precision whatever the type of the base)
+        return NaturalLog(x).finalize_and_return_outputs()*(1.0/np.log(float(base)))
+    y = validate_and_variablize(base)
+
+    shapes = (x.shape, y.shape)
+    if shapes not in _log_dispatch:
+        _log_dispatch[shapes] = _get_log_dispatch(x, y)
+    op_class, flatten_x, flatten_y = _log_dispatch[shapes]
+    if flatten_x:
+        x = x.flatten()
+    if flatten_y:
+        y = y.flatten()
+    return op_class(x, y).finalize_and_return_outputs()
+
+# (x.shape, y.shape) -> (operation class, flatten x, flatten y)
+_log_dispatch = {}
+
+def _get_log_dispatch(x, y):
     if x.shape == y.shape:
-        op = Log(x, y)
+        return Log, False, False
     elif x.size == 1:
-        op = LeftBroadcastLog(x.flatten(), y)
+        return LeftBroadcastLog, True, False
     elif y.size == 1:
-        op = RightBroadcastLog(x, y.flatten())
+        return RightBroadcastLog, False, True
     else:
         raise ValueError('Shapes not compatible for log operation.')
-        
-    return op.finalize_and_return_outputs()
 
 class TestLog(csdl_tests.CSDLTest):
     
@@ -193,6 +246,11 @@ class TestLog(csdl_tests.CSDLTest):
         s5 = csdl.log(3.0, 2.0)
         compare_values += [csdl_tests.TestingPair(s5, t3, tag = 's5')]
 
+        # log of a scalar variable with a single precision scalar constant base
+        s5_32 = csdl.log(x, np.float32(10.0))
+        t5_32 = np.array([np.log(x_val) / np.log(10.0)])
+        compare_values += [csdl_tests.TestingPair(s5_32, t5_32, tag = 's5_32')]
+
         z_val = 2.0*np.ones((3,2))
         z = csdl.Variable(name = 'z', value = z_val)
         # log of a tensor variable with tensor constant base
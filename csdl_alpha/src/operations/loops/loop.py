@@ -56,7 +56,6 @@ class Loop(SubgraphOperation):
         self.iter_vars = iter_vars # list of iteration variables
         self.loop_vars = loop_vars # (input node in graph, input for first iter, input for subsiquent iters)
         self.has_reset = False
-        self.loop_var_history = {loop_var:[] for loop_var in loop_vars}
         self.length = len(self.vals[0])
         self.parent = parent
 
@@ -67,7 +66,22 @@ class Loop(SubgraphOperation):
         self.num_loop_vars = len(loop_vars)
         for i in range(self.num_loop_vars):
             self.loop_var_lookup[loop_vars[i][2]] = self.outputs[-(self.num_loop_vars-i)]
+
+        # loop-invariant bindings for compute_inline
+        self._loop_vars = tuple(loop_vars)
+        self._outputs = tuple(self.outputs)
+        self._stack_outputs = tuple(self.outputs[-(self.num_loop_vars-i)] for i in range(self.num_loop_vars))
+        # iteration values are converted in one go to a (num_iter_vars, length, 1) array
+        # so each iteration only assigns a row view
+        iter_values = np.asarray(self.vals, dtype=np.float64).reshape(len(self.vals), self.length, 1)
+        self._iter_pairs = tuple(zip(self.iter_vars, iter_values))
         
+        self._body_schedule = None
+        self._body_schedule_key = None
+        self._parent_variables = None
+        self._parent_variables_key = None
+        self._feedback_io_sets = None
+
         self._add_outputs_to_graph()
         self._add_to_graph()
         self.assign_subgraph(graph)
@@ -97,56 +111,147 @@ class Loop(SubgraphOperation):
 
 
     def _add_outputs_to_graph(self):
-        for output in self.outputs:
-            self.recorder.active_graph.add_node(output)
+        self.recorder.active_graph.add_nodes(self.outputs)
 
-    def compute_inline(self, *args):
-        
-        # If a derivative loop, we need to reset the intermediate variables
-        if self.parent:
-            old_var_values = {}
-            for intermediate_var in self.parent.get_subgraph().node_table.keys():
-                if isinstance(intermediate_var, Variable):
-                    old_var_values[intermediate_var] = intermediate_var.value
+    def _get_parent_variables(self) -> tuple[Variable]:
+        """
+        returns the variables of the parent loop's graph, rebuilt only if that graph has changed
+        """
+        parent_graph = self.parent.get_subgraph()
+        key = (parent_graph, parent_graph._version)
+        if self._parent_variables_key != key:
+            self._parent_variables = tuple(node for node in parent_graph.node_table if isinstance(node, Variable))
+            self._parent_variables_key = key
+        return self._parent_variables
+
+    def _get_body_schedule(self) -> tuple[tuple, list, list]:
+        """
+        returns the evaluation calls of the sorted operations of the loop body, the iteration variables split into
+        those the body uses and those it does not. The body graph does not change between iterations
+        (or usually between calls) so this is only rebuilt if its structure changes.
+        """
+        body_graph = self.graph
+        key = (body_graph, body_graph._version)
+        if self._body_schedule_key != key:
+            body_operations = body_graph.get_sorted_operations()
+
+            # only iteration variables that feed an operation of the body need a value every iteration
+            iter_pairs = []
+            idle_iter_pairs = []
+            for iter_var, iter_values in self._iter_pairs:
+                if iter_var in body_graph.node_table and body_graph.out_degree(iter_var) > 0:
+                    iter_pairs.append((iter_var, iter_values))
+                else:
+                    idle_iter_pairs.append((iter_var, iter_values))
 
-        import numpy as np
-        # clear loop var history
-        for hist in self.loop_var_history.values():
-            hist.clear()
+            # the body is run as a flat list of bound evaluation calls, one per operation
+            body_steps = tuple(operation.set_inline_values for operation in body_operations)
+
+            self._body_schedule = (body_steps, iter_pairs, idle_iter_pairs)
+            self._body_schedule_key = key
+        return self._body_schedule
+
+    def _get_feedback_io_sets(self) -> tuple[frozenset[Variable], frozenset[Variable]]:
+        """
+        returns the external inputs and the outputs (including stacks) of the feedback variables.
+        These only depend on the loop variables so they are built once.
+        """
+        if self._feedback_io_sets is None:
+            feedback_inputs = frozenset(loop_var[1] for loop_var in self.loop_vars)
+            feedback_outputs = frozenset(loop_var[2] for loop_var in self.loop_vars).union(self.loop_var_lookup.values())
+            self._feedback_io_sets = (feedback_inputs, feedback_outputs)
+        return self._feedback_io_sets
+
+    def _run_with_feedback(self, body_steps:tuple, iter_pairs:list):
+        """
+        runs the loop iterations, carrying the feedback variables between iterations and
+        recording them in their stacks
+        """
+        # bind loop invariants to locals so the iterations below do no attribute lookups
+        loop_vars = self._loop_vars
+        stack_outputs = self._stack_outputs
+        inline_lazy_stack = self.inline_lazy_stack
 
         # If inline stack is True, we do not allocate memory for the stacked feedback variables
-        if not self.inline_lazy_stack:
-            for ii in range(self.num_loop_vars):
-                self.outputs[-(self.num_loop_vars-ii)].value = np.zeros(self.outputs[-(self.num_loop_vars-ii)].shape)
+        # Otherwise, each stack is allocated once per call and filled in place every iteration.
+        # The stack holds the value of the feedback variable at the start of each iteration.
+        # (A stack is not reused across calls as its previous value may still be referenced elsewhere)
+        # All stacks of a call share one allocation, each stack being a contiguous segment of it.
+        # Every slot of a stack is written below so the buffer is left uninitialized.
+        if not inline_lazy_stack:
+            stack_buffer = np.empty(sum(stack_output.size for stack_output in stack_outputs))
+            offset = 0
+        feedback = []
+        for stack_output, loop_var in zip(stack_outputs, loop_vars):
+            if inline_lazy_stack:
+                stack_value = None
+            else:
+                stack_value = stack_buffer[offset:offset+stack_output.size].reshape(stack_output.shape)
+                stack_output.value = stack_value
+                offset += stack_output.size
+            feedback.append((loop_var[0], loop_var[2], stack_value))
+
+        # Set the feedback variables for the first iteration
+        for body_input, first_input, _ in loop_vars:
+            body_input.value = first_input.value
+        if not inline_lazy_stack:
+            for body_input, _, stack_value in feedback:
+                np.copyto(stack_value[0], body_input.value)
 
         # run loop
+        # stacks record the inputs of the next iteration so nothing is recorded after the last one (or at all if lazy)
+        num_recorded = 0 if inline_lazy_stack else self.length - 1
+        for i in range(self.length):
+
+            # Set iteration variable values
+            for iter_var, iter_values in iter_pairs:
+                iter_var.value = iter_values[i]
+
+            for step in body_steps:
+                step()
+
+            # Update feedback and record the inputs of the next iteration in the same pass
+            if i < num_recorded:
+                for body_input, next_input, stack_value in feedback:
+                    value = body_input.value = next_input.value
+                    np.copyto(stack_value[i+1], value)
+            else:
+                for body_input, next_input, _ in feedback:
+                    body_input.value = next_input.value
+
+    def _run_without_feedback(self, body_steps:tuple, iter_pairs:list):
+        """
+        runs the loop iterations of a loop without feedback variables (nothing to carry or stack)
+        """
         for i in range(self.length):
-                
-            # Set feedback variables and iteration variable values
-            for loop_var in self.loop_vars:
-                if i == 0:
-                    loop_var[0].value = loop_var[1].value
-                self.loop_var_history[loop_var].append(loop_var[0].value)
-            for iter_var, val in zip(self.iter_vars, self.vals):
-                iter_var.set_value(val[i])
-
-            # compute stacked variables
-            if not self.inline_lazy_stack:
-                for ii in range(self.num_loop_vars):
-                    self.outputs[-(self.num_loop_vars-ii)].value[i] = self.loop_vars[ii][0].value
-                
-            self.graph.execute_inline()
-
-            # Update feedback
-            for loop_var in self.loop_vars:
-                loop_var[0].value = loop_var[2].value
+            for iter_var, iter_values in iter_pairs:
+                iter_var.value = iter_values[i]
+            for step in body_steps:
+                step()
 
+    def compute_inline(self, *args):
+        
         # If a derivative loop, we need to reset the intermediate variables
         if self.parent:
-            for intermediate_var in old_var_values:
-                intermediate_var.value = old_var_values[intermediate_var]
+            parent_variables = self._get_parent_variables()
+            old_var_values = [intermediate_var.value for intermediate_var in parent_variables]
+
+        body_steps, iter_pairs, idle_iter_pairs = self._get_body_schedule()
+        if self._loop_vars:
+            self._run_with_feedback(body_steps, iter_pairs)
+        else:
+            self._run_without_feedback(body_steps, iter_pairs)
+
+        # unused iteration variables are left at their final value as if they had been set every iteration
+        for iter_var, iter_values in idle_iter_pairs:
+            iter_var.value = iter_values[-1]
 
-        return [output.value for output in self.outputs]
+        # If a derivative loop, we need to reset the intermediate variables
+        if self.parent:
+            for intermediate_var, old_value in zip(parent_variables, old_var_values):
+                intermediate_var.value = old_value
+
+        return [output.value for output in self._outputs]
 
     def prep_vjp(self):
         """
@@ -170,7 +275,7 @@ class Loop(SubgraphOperation):
             print(f'loop VJP of {self.name}')
 
         # setup
-        from csdl_alpha.src.operations.loops.utils import build_feedback_data, FeedBackData, build_reversed_iteration_variables, build_external_inputs_data, build_external_outputs_data
+        from csdl_alpha.src.operations.loops.utils import build_feedback_data, FeedBackData, build_reversed_iteration_variables, build_external_inputs_data, build_external_outputs_data, _zeros_segments
 
         import csdl_alpha as csdl
         from csdl_alpha.src.operations.derivative.reverse import vjp
@@ -185,12 +290,10 @@ class Loop(SubgraphOperation):
         parent_iter_vars:list[Variable] = self.iter_vars
 
         # Organize external inputs (with cotangents)
-        feedback_inputs:set[Variable] = {feedback.external_input for feedback in feedbacks}
+        feedback_inputs, feedback_outputs = self._get_feedback_io_sets()
         parent_external_inputs, remaining_external_inputs = build_external_inputs_data(self, feedback_inputs, cotangents)
 
         # Organize external outputs (with cotangents)
-        feedback_outputs:set[Variable] = {feedback.body_external_output for feedback in feedbacks}
-        feedback_outputs.update({feedback.input_stack for feedback in feedbacks})
         parent_external_outputs = build_external_outputs_data(self, feedback_outputs, cotangents)
 
         # Checks: Comment out later
@@ -324,11 +427,12 @@ class Loop(SubgraphOperation):
 
             feedback.out_cotangent = accumulated
             vjp_external_ouputs.append(feedback.out_cotangent)
-        for parent_external_input in parent_external_inputs:
+        body_input_cotangent_zeros = _zeros_segments([external_in.external_body_IO.shape for external_in in parent_external_inputs])
+        for parent_external_input, zero_value in zip(parent_external_inputs, body_input_cotangent_zeros):
             parent_external_input.body_input_cotangent = csdl.Variable(
                 name = f'{parent_external_input.external_body_IO.name}_tangent_body',
                 shape = parent_external_input.external_body_IO.shape,
-                value = np.zeros(parent_external_input.external_body_IO.shape)
+                value = zero_value
             )
             if vjps[parent_external_input.external_body_IO] is None:
                 parent_external_input.out_cotangent = parent_external_input.body_input_cotangent
@@ -446,16 +550,21 @@ class frange():
         if vals is None:
             if upper < lower:
                 raise ValueError(f'The lower bound of the for loop, {lower}, is above the upper bound of the for loop, {upper}')
-            self.vals = [list(range(lower, upper, increment))]
+            # range validates the bounds and the increment (integers, non-zero step) as before
+            iterations = range(lower, upper, increment)
+            self.vals = [np.arange(iterations.start, iterations.stop, iterations.step, dtype=np.int64)]
         elif isinstance(vals, list):
-            if not all(isinstance(val, int) for val in vals):
+            vals = np.asarray(vals)
+            if vals.dtype.kind not in 'iu':
                 raise ValueError(f'All values in the list of values must be integers')
             self.vals = [vals]
         elif isinstance(vals, tuple):
+            self.vals = []
             for vals_list in vals:
-                if not all(isinstance(val, int) for val in vals_list):
+                vals_list = np.asarray(vals_list)
+                if vals_list.dtype.kind not in 'iu':
                     raise ValueError(f'All values in the list of values must be integers')
-            self.vals = list(vals)
+                self.vals.append(vals_list)
 
         self.curr_index = 0
         self.max_index = 2
@@ -489,47 +598,50 @@ class frange():
 
     def post_iteration_one(self):
         # self._graph.visualize(f'graph_loop_iter_1_{self}')
-        self.iter1_inputs = [] # list of inputs to the first iteration
-        self.iter1_outputs = [] # list of outputs to the first iteration
         # NOTE: variables that are created inside the loop but not used in the loop aren't going to show up in either of these lists, but that *should* be okay?
-        ops = []
-        self.iter1_non_inputs = set() # list of all other variables in first iteration (will be removed later)
-        for node in self._graph.node_table.keys():
-            if isinstance(node, Operation):
-                ops.append(node)
-                for input in node.inputs:
-                    if self._graph.in_degree(input)==0:
-                        self.iter1_inputs.append(input)
-                for output in node.outputs:
-                    self.iter1_outputs.append(output)
-            else:
-                self.iter1_non_inputs.add(node)
-
-        for input in self.iter1_inputs:
-            self.iter1_non_inputs.discard(input)
+        in_degrees = self._graph._in_degree_map()
+        ops = self._graph._op_nodes
+        self.iter1_inputs = [input for node in ops for input in node.inputs if in_degrees[input]==0] # list of inputs to the first iteration
+        self.iter1_outputs = [output for node in ops for output in node.outputs] # list of outputs to the first iteration
+        self.iter1_non_inputs = set(self._graph._var_nodes) # set of all other variables in first iteration (will be removed later)
+        self.iter1_non_inputs.difference_update(self.iter1_inputs)
 
         # don't want iteration variable to be removed, even if it's not used
         for iteration_variable in self.iteration_variables:
             self.iter1_non_inputs.discard(iteration_variable)
 
-        # deleting the operations so we cana find inputs to the second iteration in the same way
-        self._graph._delete_nodes(ops)
+        # the first iteration's operations stay in the graph until post_iteration_two, which discounts them
+        # from a snapshot of the in-degrees instead of deleting them to find the second iteration's inputs
+        self.iter1_ops = set(ops)
 
     def post_iteration_two(self):
         # self._graph.visualize(f'graph_loop_iter_2_{self}')
         self.iter2_inputs = [] # list of inputs to the second iteration (same order as first)
         self.iter2_outputs = [] # list of outputs to the second iteration (same order as first)
-        for node in self._graph.node_table.keys():
-            if isinstance(node, Operation):
-                for input in node.inputs:
-                    if self._graph.in_degree(input)==0:
-                        self.iter2_inputs.append(input)
-                for output in node.outputs:
-                    self.iter2_outputs.append(output)
+        # logically remove the first iteration's operations: their outputs lose their only incoming edge
+        in_degrees = self._graph._in_degree_map()
+        iter1_ops = self.iter1_ops
+        for output in self.iter1_outputs:
+            in_degrees[output] -= 1
+        for node in self._graph._op_nodes:
+            if node in iter1_ops:
+                continue
+            for input in node.inputs:
+                if in_degrees[input]==0:
+                    self.iter2_inputs.append(input)
+            self.iter2_outputs.extend(node.outputs)
 
         # any input that's changed represents an internal loop, so we need to replace it with a special variable
         loop_vars = []
+        added_loop_vars = set()
+        # maps each first iteration output to its position so the matching second iteration output is found directly
+        iter1_output_index = {}
+        for i, output in enumerate(self.iter1_outputs):
+            iter1_output_index.setdefault(output, i)
+        iter2_input_set = set(self.iter2_inputs)
+        node_table = self._graph.node_table
         strike_set = set() # set of inputs that are only used in the first iteration (feedback)
+        delete_set = set() # first iteration feedback inputs that the second iteration does not use
         # print(self)
         # print('in1', len(self.iter1_inputs))
         # print('in2', len(self.iter2_inputs))
@@ -543,9 +655,10 @@ class frange():
 
         for input1, input2 in zip(self.iter1_inputs, self.iter2_inputs):
             if not input1 is input2: 
-                if input2 in self.iter1_outputs:
+                output_index = iter1_output_index.get(input2)
+                if output_index is not None:
                     # we want to go from input2 to the corresponding output of the 2nd iteration
-                    output2 = self.iter2_outputs[self.iter1_outputs.index(input2)] # TODO: make this less bad
+                    output2 = self.iter2_outputs[output_index]
                     loop_var = (input2, input1, output2) # (input node in graph, input for first iter, input for subsiquent iters)
                     
                     # OLD:
@@ -553,24 +666,25 @@ class frange():
                         # self._graph._delete_nodes([input1])
                     
                     # NEW:
-                    if input1 in self._graph.node_table.keys():
-                        if not (input1 in self.iter2_inputs):
-                            self._graph._delete_nodes([input1])
+                    if input1 in node_table:
+                        if not (input1 in iter2_input_set):
+                            delete_set.add(input1)
 
                     self.iter1_non_inputs.discard(input2)
                     
                     # TODO: this is a bit of a hack, but it works for now
-                    if loop_var in loop_vars:
+                    if loop_var in added_loop_vars:
                         continue
+                    added_loop_vars.add(loop_var)
                     loop_vars.append(loop_var)
                 else:
                     # this implies input 1 and input 2 are both made in the loop, so we can just keep input 2
                     pass
-        # remove any inputs that are no longer used
-        self._graph._delete_nodes(list(strike_set))
-
-        # delete any remnanats of the first iteration
-        self._graph._delete_nodes(self.iter1_non_inputs)
+        # remove any inputs that are no longer used and any remnants of the first iteration (in one deletion)
+        delete_set.update(iter1_ops)
+        delete_set.update(strike_set)
+        delete_set.update(self.iter1_non_inputs)
+        self._graph._delete_nodes(delete_set)
         # self._graph.visualize(f'graph_loop_iter_3_{self}')
 
         external_inputs = self._graph.inputs
@@ -579,10 +693,15 @@ class frange():
         # self._graph.visualize(f'graph_loop_final_{self}')
         self._recorder._exit_subgraph()
 
-        for loop_var in loop_vars:
-            # stack_output = Variable(name = f'stack_out_{loop_var[1].name}', shape=(len(self.vals[0]),) + loop_var[0].shape, value=0)
-            stack_output = build_stacked_variable(loop_var[0], len(self.vals[0]), self.inline_lazy_stack)
-            self.iter2_outputs.append(stack_output)
+        # the stacked feedback outputs go directly after the body outputs
+        # the stacks only need a placeholder value when the loop is recorded inline inside another loop,
+        # as the enclosing body may read them before this loop runs. Otherwise compute_inline sets them
+        # right away (or nothing is computed at all when not inline).
+        num_iter = len(self.vals[0])
+        defer_stack_values = self.inline_lazy_stack or not (self._recorder.inline and self.in_loop)
+        self.iter2_outputs.extend(
+            build_stacked_variable(loop_var[0], num_iter, defer_stack_values) for loop_var in loop_vars
+        )
             
         # add the loop operation to the graph
         #NOTE: this only exposes outputs of operations, not variables created within the loop
@@ -636,10 +755,10 @@ class frange():
 def build_stacked_variable(
         feedback_var:Variable,
         num_iter:int,
-        inline_lazy_stack:bool,
+        defer_value:bool,
     ):
-    # If inline lazy stack, do not allocate memory for the stacked feedback variables
-    if inline_lazy_stack:
+    # If the value is deferred, do not allocate memory for the stacked feedback variables
+    if defer_value:
         val = None
     else:
         val = 0
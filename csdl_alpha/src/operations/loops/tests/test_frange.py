@@ -74,8 +74,24 @@ class Testfrange(csdl_tests.CSDLTest):
         with pytest.raises(ValueError):
             frange(10, 0)
 
+        with pytest.raises(ValueError):
+            frange(vals=[1, 2.5, 3])
+
+        # bounds and increments must be integers and the increment must be non-zero
+        with pytest.raises(TypeError):
+            frange(0, 3.7)
+        with pytest.raises(TypeError):
+            frange(0.5, 3)
+        with pytest.raises(TypeError):
+            frange(0, 5, increment=0.5)
+        with pytest.raises(ValueError):
+            frange(0, 5, increment=0)
+
+        f_range = frange(1, 8, increment=3)
+        assert f_range.vals[0].tolist() == [1, 4, 7]
+
         f_range = frange(vals=[1, 2, 3, 4, 5])
-        assert f_range.vals[0] == [1, 2, 3, 4, 5]
+        assert f_range.vals[0].tolist() == [1, 2, 3, 4, 5]
 
     def test_setitem(self):
         self.prep()
@@ -174,6 +190,46 @@ class Testfrange(csdl_tests.CSDLTest):
 
         assert a.value == np.array([6])
 
+    def test_no_feedback(self):
+        self.prep()
+        import csdl_alpha as csdl
+        from csdl_alpha.api import frange
+        import numpy as np
+
+        a = csdl.Variable(value=np.arange(4.0), name='a')
+        for i in frange(0, 5):
+            b = a*2.0 + i
+            c = csdl.sum(b)
+
+        compare_values = []
+        compare_values += [csdl_tests.TestingPair(b, np.arange(4.0)*2.0 + 4)]
+        compare_values += [csdl_tests.TestingPair(c, np.array([28.0]))]
+        self.run_tests(compare_values=compare_values, verify_derivatives=True)
+
+    def test_no_feedback_runs_every_iteration(self):
+        self.prep()
+        import csdl_alpha as csdl
+        from csdl_alpha.api import frange
+        import numpy as np
+
+        a = csdl.Variable(value=np.arange(4.0), name='a')
+        loop = frange(0, 5)
+        for i in loop:
+            b = a*2.0 + i
+
+        # count the evaluations of the body operation computing b
+        body_op = loop.op.graph.predecessors(b)[0]
+        compute_inline = body_op.compute_inline
+        num_evaluations = []
+        def counted_compute_inline(*args):
+            num_evaluations.append(1)
+            return compute_inline(*args)
+        body_op.compute_inline = counted_compute_inline
+
+        csdl.get_current_recorder().execute()
+        assert len(num_evaluations) == 5
+        assert np.array_equal(b.value, np.arange(4.0)*2.0 + 4)
+
     def test_multi_vals(self):
         self.prep()
         import csdl_alpha as csdl
@@ -2,6 +2,19 @@ from csdl_alpha.src.operations.loops.loop import Loop, IterationVariable
 from csdl_alpha.src.graph.variable import Variable
 import numpy as np
 
+def _zeros_segments(shapes:list[tuple])->list[np.ndarray]:
+    """
+    returns zero arrays of the given shapes that are contiguous segments of a single allocation
+    """
+    sizes = [int(np.prod(shape)) for shape in shapes]
+    buffer = np.zeros(sum(sizes))
+    segments = []
+    offset = 0
+    for shape, size in zip(shapes, sizes):
+        segments.append(buffer[offset:offset+size].reshape(shape))
+        offset += size
+    return segments
+
 def get_feedback_variables_and_stacks(loop_operation:Loop)->tuple[list[Variable], list[Variable]]:
 
     loop_vars = loop_operation.loop_vars
@@ -29,28 +42,32 @@ class ParentIOData():
 
 def build_external_inputs_data(
         loop_operation:Loop,
-        feedback_inputs:set[Variable],
+        feedback_inputs:frozenset[Variable],
         cotangents,)->tuple[list[ParentIOData],list[Variable]]:
     parent_external_inputs:list[ParentIOData] = []
     remaining_parent_external_inputs:list[Variable] = []
+    body_node_table = loop_operation.get_subgraph().node_table
     for input in loop_operation.inputs:
         # TODO: Double check correctness of this condition
         # This is to avoid feedback inputs
-        if input in loop_operation.get_subgraph().node_table:
+        if input in body_node_table:
             if cotangents.check(input):
-                input_data = ParentIOData(input)
-                input_data.external_input_cotangent = Variable(
-                    name = f'{input.name}_ext_cot_in',
-                    value = np.zeros(input.shape),
-                )
-                parent_external_inputs.append(input_data)
+                parent_external_inputs.append(ParentIOData(input))
             else:
                 remaining_parent_external_inputs.append(input)
+
+    # the initial cotangents share one zero allocation
+    zeros = _zeros_segments([input_data.external_body_IO.shape for input_data in parent_external_inputs])
+    for input_data, zero_value in zip(parent_external_inputs, zeros):
+        input_data.external_input_cotangent = Variable(
+            name = f'{input_data.external_body_IO.name}_ext_cot_in',
+            value = zero_value,
+        )
     return parent_external_inputs, remaining_parent_external_inputs
 
 def build_external_outputs_data(
         loop_operation:Loop,
-        feedback_outputs:set[Variable],
+        feedback_outputs:frozenset[Variable],
         cotangents,)->list[ParentIOData]:
     parent_external_outputs:list[Variable] = []
     for output in loop_operation.outputs:
@@ -118,9 +135,9 @@ def build_reversed_iteration_variables(
     # Build the reversed iteration variables
     reversed_iter_vars:list[IterationVariable] = []
     for orig_iter_var in parent_iter_vars:
-        reversed_vals = list(reversed(orig_iter_var.vals))
+        reversed_vals = orig_iter_var.vals[::-1]
         reversed_iter_vars.append(IterationVariable(vals = reversed_vals))
     
     # Build reversed indexing variable
-    reversed_range = list(reversed(range(len(parent_iter_vars[0].vals))))
+    reversed_range = list(range(len(parent_iter_vars[0].vals)-1, -1, -1))
     return IterationVariable(vals = reversed_range), reversed_iter_vars
\ No newline at end of file
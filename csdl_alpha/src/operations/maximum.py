@@ -4,6 +4,8 @@ from csdl_alpha.utils.inputs import variablize, validate_and_variablize
 import csdl_alpha.utils.testing_utils as csdl_tests
 import csdl_alpha as csdl
 
+from csdl_alpha.src.operations.derivative.utils import get_uncontract_action
+
 import numpy as np
 
 class Maximum(Operation):
@@ -17,48 +19,12 @@ class Maximum(Operation):
         self.set_dense_outputs(out_shapes)
         self.axes  = axes
         self.rho   = rho
-        in_shape = x.shape
 
         if axes is not None:
-            axes = self.axes  = tuple(np.sort(axes))
-            rank = len(in_shape)
-            alphabet  = 'abcdefghijklmnopqrstuvwxyz'
-            in1_str = alphabet[:axes[0]]
-            in2_str = alphabet[axes[0]]
-            ones_shape = (in_shape[axes[0]],)
-            for i in range(len(axes)-1):
-                in1_str += alphabet[axes[i] + 1 : axes[i + 1]]
-                in2_str += alphabet[axes[i+1]]
-                ones_shape += (in_shape[axes[i+1]],)
-            in1_str += alphabet[axes[-1] + 1 : rank]
-            self.einsum_str = '{},{}->{}'.format(
-                in1_str,
-                in2_str,
-                alphabet[:rank],
-                )
-            self.ones_shape = ones_shape
+            self.axes  = tuple(sorted(axes))
 
     def compute_inline(self, x):
-        rho = self.rho
-        axes = self.axes
-
-        if axes is None:
-            x_max = np.max(x)
-            smooth_max = x_max + 1/rho * np.log(np.sum(np.exp(rho * (x - x_max))))
-            return smooth_max
-        else:
-            ones_shape = self.ones_shape
-            axeswise_max = np.max(x, axis=self.axes)
-            # print(self.einsum_str, axeswise_max.shape, ones_shape)
-            difference = x - np.einsum(
-                self.einsum_str,
-                axeswise_max,
-                np.ones(ones_shape),
-                )
-            exp = np.exp(rho * difference)
-            summation = np.sum(exp, axis=axes)
-            smooth_axeswise_max = axeswise_max + 1.0 / rho * np.log(summation)
-            return smooth_axeswise_max
+        return _smooth_max(x, self.rho, self.axes)
 
     def evaluate_vjp(self, cotangents, x, y):
         if cotangents.check(x):
@@ -70,9 +36,7 @@ class Maximum(Operation):
                 rho = self.rho
                 axes = self.axes
 
-                in_str, out_str  = self.einsum_str.split('->')
-                in_str, ones_str = in_str.split(',')
-                exp_str = in_str + '->' + out_str
+                exp_str = get_uncontract_action(x.shape, axes)
                 exp_term = csdl.exp(rho*(x-csdl.expand(y, x.shape, exp_str)))
                 sum = csdl.sum(exp_term, axes=axes)
                 expanded_sum = csdl.expand(sum, out_shape=x.shape, action=exp_str)
@@ -93,13 +57,20 @@ class ElementwiseMaximum(Operation):
 
     def compute_inline(self, *args):
         rho = self.rho
-        ew_max = args[0]
-        for arg in args[1:]:
-            ew_max = np.maximum(ew_max, arg)
+        if len(args) == 2:
+            # log(exp(rho*a) + exp(rho*b))/rho evaluated stably by a single ufunc
+            smooth_ew_max = np.logaddexp(rho * args[0], rho * args[1])
+            smooth_ew_max *= 1. / rho
+            return smooth_ew_max
+
+        # stack the arguments so the max and the exp-sum are single reductions over the first axis
+        stacked = np.stack(args)
+        ew_max = stacked.max(axis=0)
 
-        summation = 0.
-        for arg in args:
-            summation += np.exp(rho * (arg - ew_max))
+        np.subtract(stacked, ew_max, out=stacked)
+        np.multiply(stacked, rho, out=stacked)
+        np.exp(stacked, out=stacked)
+        summation = stacked.sum(axis=0)
 
         smooth_ew_max = (ew_max + 1. / rho * np.log(summation))
         return smooth_ew_max
@@ -115,6 +86,21 @@ class ElementwiseMaximum(Operation):
 
                 # cotangents.accumulate(input_var, csdl.exp(rho*(input_var-output))*sum)
 
+def _smooth_max(x:np.ndarray, rho:float, axes:tuple)->np.ndarray:
+    """
+    max(x) + log(sum(exp(rho*(x-max(x)))))/rho over the given axes (all entries if axes is None).
+    Uses a single temporary that the shift, scale and exp are applied to in place.
+    """
+    x_max = x.max(axis=axes, keepdims=True)
+    exp = np.subtract(x, x_max)
+    np.multiply(exp, rho, out=exp)
+    np.exp(exp, out=exp)
+    log_sum = np.log(exp.sum(axis=axes))
+    log_sum *= 1.0 / rho
+    if axes is None:
+        return x_max.reshape(()) + log_sum
+    return x_max.squeeze(axes) + log_sum
+
 def maximum(*args, axes=None, rho=20.):
     '''
     Computes the maximum entry in the input tensor if a single argument is provided.
@@ -264,6 +250,10 @@ class TestMaximum(csdl_tests.CSDLTest):
         # s6.add_name('s6')
         compare_values += [csdl_tests.TestingPair(s6, t5, tag = 's6', decimal=8)]
 
+        # elementwise maximum of two tensor variables
+        s8 = csdl.maximum(x, y)
+        compare_values += [csdl_tests.TestingPair(s8, t5, tag = 's8', decimal=8)]
+
         # TODO: maximum of a zero tensor - need to check this 
         # to avoid errors from sum(log(1+1+..)) if there are multiple entries of zero
         # and zero is the maximum
@@ -6,7 +6,6 @@ from csdl_alpha.src.graph.variable import Variable, Constant
 
 @set_properties(elementwise = True, diagonal_jacobian = True)
 class ElementwiseOperation(Operation):
-
     def __init__(self,*args, **kwargs):
         super().__init__(*args, **kwargs)
         out_shapes = (args[0].shape,)
@@ -85,8 +84,7 @@ class ComposedOperation(SubgraphOperation):
 
     def finalize_and_return_outputs(self):
         self.recorder._enter_subgraph(name = self.name)
-        for input in self.inputs:
-            self.recorder._add_node(input)
+        self.recorder._add_nodes(self.inputs)
         outputs = self.evaluate_composed(*self.inputs)
 
         if isinstance(outputs, tuple):
@@ -98,8 +96,7 @@ class ComposedOperation(SubgraphOperation):
 
         self.recorder._exit_subgraph()
 
-        for output in self.outputs:
-            self.recorder._add_node(output)
+        self.recorder._add_nodes(self.outputs)
 
         outputs = super().finalize_and_return_outputs(skip_inline = True)
         return outputs
@@ -2,8 +2,9 @@ from csdl_alpha.src.operations.operation_subclasses import ElementwiseOperation,
 from csdl_alpha.src.graph.operation import Operation, set_properties 
 from csdl_alpha.src.graph.variable import Variable
 from csdl_alpha.utils.inputs import variablize, validate_and_variablize
-from csdl_alpha.src.operations.set_get.loop_slice import VarSlice
+from csdl_alpha.src.operations.set_get.loop_slice import VarSlice, arg_to_int
 from csdl_alpha.src.operations.set_get.slice import Slice
+from csdl_alpha.src.operations.set_get.utils import get_sliced_shape
 
 import csdl_alpha.utils.testing_utils as csdl_tests
 import numpy as np
@@ -24,8 +25,54 @@ class GetVarIndex(Operation):
         self.set_dense_outputs(out_shapes)
         self.slice = slice
 
+        # The evaluated slice is folded into an index which is kept for the most recent values of the
+        # slice variables (once and for all if there are none) so repeated evaluations only look it up:
+        # - 'take': a single index list between ranges is gathered along its axis (np.take) from the ranged view of the input
+        # - 'flat': advanced-only indexing is a single gather from the input flattened over the sliced axes
+        # - 'key': anything else indexes the input with the evaluated slice directly
+        self.last_index = (None, None)
+        self.take_axis = slice.single_index_list_axis()
+        if self.take_axis is not None:
+            self.index_mode = 'take'
+        elif slice.is_index_array():
+            self.index_mode = 'flat'
+            self.gather_shape = (-1,) + x.shape[len(slice.slices):]
+        elif not slice.vars and slice.has_index_list():
+            # A constant slice mixing ranges and index lists is turned into flat indices of the whole input
+            self.index_mode = 'flat'
+            self.gather_shape = (-1,)
+            self.last_index = ((), np.arange(x.size).reshape(x.shape)[slice.evaluate()].ravel())
+        else:
+            self.index_mode = 'key'
+
     def compute_inline(self, x, *slice_args):
-        return x[self.slice.evaluate(*slice_args)].reshape(self.out_shape)
+        arg_ints = tuple(arg_to_int(slice_arg) for slice_arg in slice_args)
+        last_ints, index = self.last_index
+        if arg_ints != last_ints:
+            index = self._fold_index(x.shape, slice_args)
+            self.last_index = (arg_ints, index)
+
+        index_mode = self.index_mode
+        if index_mode == 'take':
+            keys, take_index = index
+            return x[keys].take(take_index, axis=self.take_axis).reshape(self.out_shape)
+        if index_mode == 'flat':
+            return x.reshape(self.gather_shape)[index].reshape(self.out_shape)
+        return x[index].reshape(self.out_shape)
+
+    def _fold_index(self, x_shape:tuple, slice_args:tuple):
+        """
+        evaluates the slice for the given slice variable values into the index used by compute_inline
+        """
+        if self.index_mode == 'flat':
+            return self.slice.as_flat_index(x_shape, *slice_args)
+        # copy the index lists as the slice evaluates into the same lists every time
+        keys = [list(key) if isinstance(key, list) else key for key in self.slice.evaluate(*slice_args)]
+        if self.index_mode == 'take':
+            take_index = np.array(keys[self.take_axis])
+            keys[self.take_axis] = slice(None)
+            return tuple(keys), take_index
+        return tuple(keys)
 
     def evaluate_vjp(self, cotangents, x, *slice_args_and_outputs):
         import csdl_alpha as csdl
@@ -51,7 +98,7 @@ def get_index(x:Variable, slices: Slice, shape = None):
         #     from csdl_alpha.utils.error_utils.error_utils import check_if_valid_shape
         #     check_if_valid_shape(shape)
 
-        shape = np.zeros(x.shape)[slices.evaluate_zeros()].shape
+        shape = get_sliced_shape(x.shape, slices.evaluate_zeros())
         if shape == ():
             shape = (1,)
 
@@ -141,6 +188,14 @@ class TestGet(csdl_tests.CSDLTest):
         x12 = y[0:1, [int_1, 1, 1],[int_2, int_2, int_1], int_2:int_2+2]
         compare_values += [csdl_tests.TestingPair(x12, y_val[0:1, [2, 1, 1],[5, 5, 2], 5:7])]
 
+        x13 = x[[ind_var, -1, 3], 4]
+        compare_values += [csdl_tests.TestingPair(x13, x_val[[1, -1, 3], 4])]
+
+        # constant slices only depend on the sliced variable
+        x14 = y[1:3, [1, 1, 1],[1, 2, 3], ::2]
+        compare_values += [csdl_tests.TestingPair(x14, y_val[1:3, [1, 1, 1],[1, 2, 3], ::2])]
+        assert len(x14.recorder.active_graph.predecessors(x14)[0].inputs) == 1
+
         with pytest.raises(IndexError):
             x_error = y[0:2, [1, 1, 1],[1, 2], 0:2]
         with pytest.raises(IndexError):
@@ -188,6 +243,7 @@ class TestGet(csdl_tests.CSDLTest):
         compare_values += [csdl_tests.TestingPair(x10, y_val[1:4, [1, 1, 1],[1, 2, 3], 4:6])]
         compare_values += [csdl_tests.TestingPair(x11, y_val[1:4, [1, 1, 1],[4, 4, 1], 4:6])]
         compare_values += [csdl_tests.TestingPair(x12, y_val[0:1, [1, 1, 1],[4, 4, 1], 4:6])]
+        compare_values += [csdl_tests.TestingPair(x13, x_val[[2, -1, 3], 4])]
 
         self.run_tests(compare_values = compare_values)
 
@@ -230,6 +286,28 @@ class TestGet(csdl_tests.CSDLTest):
 
         self.run_tests(compare_values = compare_values, verify_derivatives=True)
 
+    def test_index_reuse(self):
+        self.prep()
+        import csdl_alpha as csdl
+        import numpy as np
+
+        x_val = np.arange(20.0).reshape(5,4)
+        x = csdl.Variable(name = 'x', value = x_val)
+        ind = csdl.Variable(name = 'ind', value = 1)
+        y = x[ind, [0, 2]]
+        op = csdl.get_current_recorder().active_graph.predecessors(y)[0]
+
+        # only the index for the most recent value of the slice variables is kept
+        recorder = csdl.get_current_recorder()
+        for i in range(5):
+            ind.value = i
+            recorder.execute()
+            assert np.array_equal(y.value, x_val[i, [0, 2]])
+            assert op.last_index[0] == (i,)
+
+        compare_values = [csdl_tests.TestingPair(y, x_val[4, [0, 2]])]
+        self.run_tests(compare_values = compare_values)
+
 
 if __name__ == '__main__':
     test = TestGet()
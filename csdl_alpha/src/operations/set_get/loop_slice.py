@@ -164,13 +164,57 @@ class VarSlice(Slice):
         for arg_index, arg_value in enumerate(args):
             # arg_index is the index of the CSDL variable
             # arg_value is the value of that CSDL variable
-            if isinstance(arg_value, np.ndarray):
-                arg_int = int(arg_value[0]) # value that has been cast to an integer to replace slice variable
-            else:
-                arg_int = int(arg_value) # value that has been cast to an integer to replace slice variable
+            arg_int = arg_to_int(arg_value) # value that has been cast to an integer to replace slice variable
 
             maps = self.var2slicemap[arg_index]
             for map in maps:
                 map[0](map[1], arg_int)
         return tuple(self.slices)
 
+    def has_index_list(self)->bool:
+        """
+        Returns True if the slice has at least one index list key (ie, it does advanced indexing)
+        """
+        return any(isinstance(key, list) for key in self.slices)
+
+    def is_index_array(self)->bool:
+        """
+        Returns True if the slice only has integer and index list keys, with at least one index list
+        (ie, it only does advanced indexing)
+        """
+        return self.has_index_list() and not any(isinstance(key, slice) for key in self.slices)
+
+    def single_index_list_axis(self)->int:
+        """
+        Returns the axis of the index list key if it is the only one and every other key is a range,
+        None otherwise
+        """
+        axis = None
+        for i, key in enumerate(self.slices):
+            if isinstance(key, list):
+                if axis is not None:
+                    return None
+                axis = i
+            elif not isinstance(key, slice):
+                return None
+        return axis
+
+    def as_flat_index(self, x_shape:tuple, *args:tuple[float])->np.ndarray:
+        """
+        Returns the 1D indices of the sliced entries of an array of shape x_shape
+        flattened over the sliced (leading) axes. Only valid if is_index_array() is True.
+        """
+        index_arrays = []
+        for key, dim in zip(self.evaluate(*args), x_shape):
+            key = np.asarray(key)
+            index_arrays.append(np.where(key < 0, key + dim, key))
+        return np.ravel_multi_index(index_arrays, x_shape[:len(index_arrays)]).ravel()
+
+def arg_to_int(arg_value)->int:
+    """
+    casts the value of a slice variable to an integer
+    """
+    if isinstance(arg_value, np.ndarray):
+        return int(arg_value[0])
+    return int(arg_value)
+
@@ -6,6 +6,7 @@ from csdl_alpha.utils.inputs import variablize, validate_and_variablize
 import csdl_alpha.utils.testing_utils as csdl_tests
 from csdl_alpha.src.operations.set_get.slice import Slice
 from csdl_alpha.src.operations.set_get.loop_slice import VarSlice
+from csdl_alpha.src.operations.set_get.utils import get_sliced_shape
 import pytest
 from csdl_alpha.utils.typing import VariableLike
 import numpy as np
@@ -86,9 +87,8 @@ def set_index(x:Variable, s:Slice, y:VariableLike) -> Variable:
     y = validate_and_variablize(y)
 
     if y.size != 1:
-        import numpy as np
         # TODO: index out of bounds error from csdl instead of numpy
-        slice_shape = np.zeros(x.shape)[s.evaluate_zeros()].shape
+        slice_shape = get_sliced_shape(x.shape, s.evaluate_zeros())
 
         # from csdl_alpha.utils.slice import get_slice_shape
         # slice_shape_ = get_slice_shape(s, x.shape)
@@ -1,4 +1,13 @@
 import numpy as np
+
+def get_sliced_shape(shape:tuple, keys:tuple)->tuple:
+    """
+    Returns the shape of an array of the given shape indexed by keys,
+    probing a zero-stride view so no array of that shape is allocated.
+    Raises numpy's IndexError if the keys are out of bounds.
+    """
+    return np.broadcast_to(np.zeros((), dtype=np.int8), shape)[keys].shape
+
 def check_and_process_out_of_bound_slice(slices, shape):
     """
     slices: list of slices or 1 slice
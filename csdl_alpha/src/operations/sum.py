@@ -1,5 +1,5 @@
 from csdl_alpha.src.graph.operation import Operation, set_properties
-from csdl_alpha.src.operations.operation_subclasses import ComposedOperation
+from csdl_alpha.src.operations.operation_subclasses import ElementwiseOperation
 from csdl_alpha.src.graph.variable import Variable
 from csdl_alpha.utils.inputs import variablize, validate_and_variablize
 import csdl_alpha.utils.testing_utils as csdl_tests
@@ -34,22 +34,34 @@ class Sum(Operation):
                 action = get_uncontract_action(x.shape, self.axes)
                 cotangents.accumulate(x, csdl.expand(cotangents[y], out_shape=x.shape, action = action))
 
-class ElementwiseSum(ComposedOperation):
+@set_properties(linear=True)
+class ElementwiseSum(ElementwiseOperation):
     '''
     Elementwise sum of all the Variables in the arguments.
+    Repeated Variables are given once, with the number of times they appear in counts.
     '''
-    def __init__(self, *args):
+    def __init__(self, *args, counts):
         super().__init__(*args)
         self.name = 'elementwise_sum'
-
-    def evaluate_composed(self, *args):
-        return evaluate_elementwise_sum(*args)
-
-def evaluate_elementwise_sum(*args):
-    out = args[0] + args[1]
-    for i in range(2, len(args)):
-        out = out + args[i]
-    return out
+        self.counts = counts
+
+    def compute_inline(self, *args):
+        out = args[0]*self.counts[0]
+        for arg, count in zip(args[1:], self.counts[1:]):
+            if count == 1:
+                out = out + arg
+            else:
+                out = out + count*arg
+        return out
+
+    def evaluate_vjp(self, cotangents, *args):
+        y = args[-1]
+        for x, count in zip(args[:-1], self.counts):
+            if cotangents.check(x):
+                if count == 1:
+                    cotangents.accumulate(x, cotangents[y])
+                else:
+                    cotangents.accumulate(x, cotangents[y]*count)
 
 def sum(*args, axes=None)->Variable:
     '''
@@ -97,6 +109,14 @@ def sum(*args, axes=None)->Variable:
     >>> y3.value
     array([[3., 4., 5.],
            [6., 7., 8.]])
+
+    Summing many variables this way records a single operation
+    instead of a chain of additions
+
+    >>> y4 = csdl.sum(*[x]*100)
+    >>> y4.value
+    array([[  0., 100., 200.],
+           [300., 400., 500.]])
     '''
     # Multiple Variables to sum
     if axes is not None and len(args) > 1:
@@ -126,8 +146,12 @@ def sum(*args, axes=None)->Variable:
         op = Sum(validate_and_variablize(args[0]), axes=axes, out_shape=out_shape)
     else:
         # axes is None for multiple variables
-        args = [validate_and_variablize(x) for x in args]
-        op = ElementwiseSum(*args)
+        # repeated variables become a single input of the op, scaled by how often they appear
+        counts = {}
+        for x in args:
+            x = validate_and_variablize(x)
+            counts[x] = counts.get(x, 0) + 1
+        op = ElementwiseSum(*counts.keys(), counts=tuple(counts.values()))
     
     return op.finalize_and_return_outputs()
 
@@ -187,6 +211,11 @@ class TestSum(csdl_tests.CSDLTest):
         s5 = csdl.sum(x_val, y_val, z_val)
         compare_values += [csdl_tests.TestingPair(s5, t4, tag = 's5')]
 
+        # elementwise sum with repeated variables
+        s6 = csdl.sum(x, y, x, x, z)
+        t6 = 3.0*x_val + y_val + z_val
+        compare_values += [csdl_tests.TestingPair(s6, t6, tag = 's6')]
+
         self.run_tests(compare_values = compare_values,verify_derivatives=True)
 
     def test_example(self,):
@@ -41,15 +41,20 @@ class TensorExpand(Operation):
         self.ones_shape = ones_shape
         self.einsum_str = einsum_str
 
+        # the expansion is a transpose of x into output axis order followed by a broadcast over the new axes
+        in_str, out_str = einsum_str.split('->')
+        in_str = in_str.split(',')[0]
+        self.in_axes_order = tuple(sorted(range(len(in_str)), key=lambda i: out_str.index(in_str[i])))
+        self.broadcast_shape = tuple(out_shape[i] if char in in_str else 1 for i, char in enumerate(out_str))
+
         out_shapes = (out_shape,)
         self.set_dense_outputs(out_shapes)
 
     def compute_inline(self, x):
         # NOTE : if csdl.einsum is implemented using csdl.[sum, expand, reorder_axes, mult] later,
         # then the line below should never call csdl.einsum since it just creates recursive calls.
-        # print(self.einsum_str, (self.ones_shape))
-        # exit()
-        return np.einsum(self.einsum_str, x, np.ones(self.ones_shape))
+        x = x.transpose(self.in_axes_order).reshape(self.broadcast_shape)
+        return np.broadcast_to(x, self.out_shape).copy()
     
     def evaluate_vjp(self, cotangents, x, y):
         if cotangents.check(x):
@@ -6,6 +6,17 @@ import numpy as np
 from csdl_alpha.utils.typing import VariableLike
 from csdl_alpha.utils.inputs import validate_and_variablize
 
+def _reuse_vjp_factor(cotangents, x:Variable, build)->Variable:
+    """
+    returns build(x), reusing the variable built earlier in the same derivative build by any
+    operation on x with the same build function (e.g. arcsin and arccos)
+    """
+    key = (x, build)
+    factor = cotangents.vjp_factors.get(key)
+    if factor is None:
+        factor = cotangents.vjp_factors[key] = build(x)
+    return factor
+
 @set_properties(linear=False)
 class Sin(ElementwiseOperation):
     def __init__(self,x):
@@ -17,7 +28,7 @@ class Sin(ElementwiseOperation):
 
     def evaluate_vjp(self, cotangents, x, y):
         if cotangents.check(x):
-            cotangents.accumulate(x, cotangents[y]*cos(x))
+            cotangents.accumulate(x, cotangents[y]*_reuse_vjp_factor(cotangents, x, cos))
 
 @set_properties(linear=False)
 class ArcSin(ElementwiseOperation):
@@ -30,7 +41,7 @@ class ArcSin(ElementwiseOperation):
 
     def evaluate_vjp(self, cotangents, x, y):
         if cotangents.check(x):
-            cotangents.accumulate(x, cotangents[y]/(1.0 - x**2)**0.5)
+            cotangents.accumulate(x, cotangents[y]*_reuse_vjp_factor(cotangents, x, _arcsin_derivative))
 
 @set_properties(linear=False)
 class Cos(ElementwiseOperation):
@@ -43,7 +54,7 @@ class Cos(ElementwiseOperation):
     
     def evaluate_vjp(self, cotangents, x, y):
         if cotangents.check(x):
-            cotangents.accumulate(x, -cotangents[y]*sin(x))
+            cotangents.accumulate(x, -cotangents[y]*_reuse_vjp_factor(cotangents, x, sin))
 
 @set_properties(linear=False)
 class ArcCos(ElementwiseOperation):
@@ -56,7 +67,7 @@ class ArcCos(ElementwiseOperation):
     
     def evaluate_vjp(self, cotangents, x, y):
         if cotangents.check(x):
-            cotangents.accumulate(x, -cotangents[y]/(1.0 - x**2)**0.5)
+            cotangents.accumulate(x, -cotangents[y]*_reuse_vjp_factor(cotangents, x, _arcsin_derivative))
 
 @set_properties(linear=False)
 class Tan(ElementwiseOperation):
@@ -69,7 +80,7 @@ class Tan(ElementwiseOperation):
 
     def evaluate_vjp(self, cotangents, x, y):
         if cotangents.check(x):
-            cotangents.accumulate(x, cotangents[y]/(cos(x)**2))
+            cotangents.accumulate(x, cotangents[y]*_reuse_vjp_factor(cotangents, x, _tan_derivative))
 
 @set_properties(linear=False)
 class ArcTan(ElementwiseOperation):
@@ -82,7 +93,7 @@ class ArcTan(ElementwiseOperation):
 
     def evaluate_vjp(self, cotangents, x, y):
         if cotangents.check(x):
-            cotangents.accumulate(x, cotangents[y]/(1.0 + x**2))
+            cotangents.accumulate(x, cotangents[y]*_reuse_vjp_factor(cotangents, x, _arctan_derivative))
 
 @set_properties(linear=False)
 class Tanh(ElementwiseOperation):
@@ -95,7 +106,7 @@ class Tanh(ElementwiseOperation):
 
     def evaluate_vjp(self, cotangents, x, y):
         if cotangents.check(x):
-            cotangents.accumulate(x, cotangents[y]*(1-tanh(x)**2))
+            cotangents.accumulate(x, cotangents[y]*(1.0-y*y))
 
 @set_properties(linear=False)
 class Sinh(ElementwiseOperation):
@@ -108,7 +119,7 @@ class Sinh(ElementwiseOperation):
 
     def evaluate_vjp(self, cotangents, x, y):
         if cotangents.check(x):
-            cotangents.accumulate(x, cotangents[y]*cosh(x))
+            cotangents.accumulate(x, cotangents[y]*_reuse_vjp_factor(cotangents, x, cosh))
 
 @set_properties(linear=False)
 class Cosh(ElementwiseOperation):
@@ -121,7 +132,17 @@ class Cosh(ElementwiseOperation):
 
     def evaluate_vjp(self, cotangents, x, y):
         if cotangents.check(x):
-            cotangents.accumulate(x, cotangents[y]*sinh(x))
+            cotangents.accumulate(x, cotangents[y]*_reuse_vjp_factor(cotangents, x, sinh))
+
+def _arcsin_derivative(x:Variable) -> Variable:
+    return (1.0 - x*x)**-0.5
+
+def _arctan_derivative(x:Variable) -> Variable:
+    return 1.0/(1.0 + x*x)
+
+def _tan_derivative(x:Variable) -> Variable:
+    cos_x = cos(x)
+    return 1.0/(cos_x*cos_x)
 
 def sin(x:VariableLike) -> Variable:
     """Elementwise sine of a CSDL Variable
@@ -442,3 +463,34 @@ class TestTrig(csdl_tests.CSDLTest):
         self.docstest(tanh)
         self.docstest(sinh)
         self.docstest(cosh)
+
+    def test_vjp_reuse(self):
+        self.prep()
+
+        import csdl_alpha as csdl
+        import numpy as np
+        x = csdl.Variable(name = 'x', value = np.array([0.1, 0.2, 0.3]))
+        y = csdl.sin(x)
+        graph = csdl.get_current_recorder().active_graph
+
+        # the rows of one derivative build share a single cos(x)
+        dy_dx_1 = csdl.derivative(y, x, loop=False)
+        num_cos = sum(isinstance(node, Cos) for node in graph.node_table)
+        assert num_cos == 1
+        np.testing.assert_array_almost_equal(dy_dx_1.value, np.diag(np.cos(x.value)))
+
+        # a new derivative build does not reuse factors of a previous one
+        dy_dx_2 = csdl.derivative(y, x, loop=False)
+        num_cos = sum(isinstance(node, Cos) for node in graph.node_table)
+        assert num_cos == 2
+        np.testing.assert_array_almost_equal(dy_dx_1.value, dy_dx_2.value)
+
+        # arcsin and arccos of the same variable share their derivative factor
+        from csdl_alpha.src.operations.power import Power, RightBroadcastPower
+        z = csdl.Variable(name = 'z', value = np.array([0.1, 0.2, 0.3]))
+        w = csdl.sum(csdl.arcsin(z)) + csdl.sum(csdl.arccos(z))
+        num_powers = sum(isinstance(node, (Power, RightBroadcastPower)) for node in graph.node_table)
+        dw_dz = csdl.derivative(w, z, loop=False)
+        num_powers = sum(isinstance(node, (Power, RightBroadcastPower)) for node in graph.node_table) - num_powers
+        assert num_powers == 1
+        np.testing.assert_array_almost_equal(dw_dz.value, np.zeros((1, 3)))
@@ -1,6 +1,7 @@
 from csdl_alpha.src.graph.graph import Graph
 from csdl_alpha.utils.inputs import get_type_string
 import numpy as np
+import sys
 
 class Recorder:
     """
@@ -121,12 +122,13 @@ class Recorder:
         #TODO: TEST TEST TEST TEST
 
         from csdl_alpha.src.operations.operation_subclasses import SubgraphOperation
-        from csdl_alpha.src.graph.variable import Variable
+        from csdl_alpha.src.graph.variable import Variable, Constant
 
         information_dict = {}
         information_dict['names2nodes'] = {}
         information_dict['nodes2graphs'] = {}
         information_dict['input_nodes'] = set()
+        information_dict['input_nodes_nonconst'] = set()
         information_dict['graph_tree'] = {}
         information_dict['analytics'] = {
             'number of nodes': 0,
@@ -167,6 +169,8 @@ class Recorder:
                     if current_graph is root_graph:
                         if len(current_graph.predecessors(node)) == 0:
                             information_dict['input_nodes'].add(node)
+                            if not isinstance(node, Constant):
+                                information_dict['input_nodes_nonconst'].add(node)
                         
                 else:
                     information_dict['analytics']['number of operations'] += 1
@@ -236,18 +240,20 @@ class Recorder:
         if not isinstance(name, str):
             raise TypeError("Name of namespace is not a string")
         
-        if name in self.active_namespace.child_names:
+        active_namespace = self.active_namespace
+        if name in active_namespace.child_names:
             raise Exception("Attempting to enter existing namespace")
         
         self.hierarchy += 1
-        self.active_namespace.child_names.add(name)
+        name = sys.intern(name)
+        active_namespace.child_names.add(name)
 
-        if self.active_namespace.name is None:
+        if active_namespace.name is None:
             prepend = name
         else:
-            prepend = self.active_namespace.prepend + '.' + name
+            prepend = f'{active_namespace.prepend}.{name}'
 
-        self.active_namespace = self.active_namespace.add_child(name, prepend=prepend)
+        self.active_namespace = active_namespace.add_child(name, prepend=prepend)
 
     def _exit_namespace(self):
         """
@@ -257,7 +263,6 @@ class Recorder:
             raise Exception("Attempting to exit root namespace")
         self.hierarchy -= 1
         self.active_namespace = self.active_namespace.parent
-        self.active_namespace = self.active_namespace
 
     def _enter_subgraph(
             self,
@@ -311,16 +316,57 @@ class Recorder:
         self.active_graph.add_node(node)
         self.node_graph_map[node] = [self.active_graph]
 
+    def _add_nodes(self, nodes):
+        """
+        Adds several nodes to the active graph at once.
+
+        Args:
+            nodes: The nodes to add.
+        """
+        graph = self.active_graph
+        graph.add_nodes(nodes)
+        node_graph_map = self.node_graph_map
+        for node in nodes:
+            node_graph_map[node] = [graph]
+
     def _set_namespace(self, node):
         """
         sets namespace of node.
         """
-        from csdl_alpha.src.graph.variable import Variable
         self.active_namespace.nodes.append(node)
         node.namespace = self.active_namespace
-        if self.auto_hierarchy and isinstance(node, Variable):
+        if self.auto_hierarchy and node._is_variable:
             node.set_hierarchy(self.hierarchy)
 
+    def _add_operation_edges(self, operation):
+        """
+        Adds the edges from the inputs of an operation to the operation and from the operation
+        to its outputs in the active graph, looking up each node's index once.
+
+        Args:
+            operation: The operation (already in the active graph).
+        """
+        graph = self.active_graph
+        node_table = graph.node_table
+        operation_index = node_table[operation]
+        edges = []
+        for input_variable in operation.inputs:
+            input_index = node_table.get(input_variable)
+            if input_index is None:
+                if graph.add_missing_variables and input_variable._is_variable:
+                    graph.add_node(input_variable)
+                    if not input_variable in graph.inputs: graph.inputs.append(input_variable)
+                    input_index = node_table[input_variable]
+                else:
+                    raise ValueError(f"Node {input_variable.name} not in graph")
+            edges.append((input_index, operation_index, (input_index, operation_index)))
+        for output_variable in operation.outputs:
+            output_index = node_table.get(output_variable)
+            if output_index is None:
+                raise ValueError(f"Node {output_variable.name} not in graph")
+            edges.append((operation_index, output_index, (operation_index, output_index)))
+        graph.add_edges_from(edges)
+
     def _add_edge(self, node_from, node_to):
         """
         Adds an edge between two nodes in the active graph.
@@ -329,10 +375,9 @@ class Recorder:
             node_from: The source node.
             node_to: The target node.
         """
-        from csdl_alpha.src.graph.variable import Variable
         graph = self.active_graph
         if node_from not in graph.node_table: # TODO: consider changing node_graph_map to reflect this
-            if graph.add_missing_variables and isinstance(node_from, Variable):
+            if graph.add_missing_variables and node_from._is_variable:
                 graph.add_node(node_from)
                 if not node_from in graph.inputs: graph.inputs.append(node_from)
             else:
@@ -538,6 +583,7 @@ class Tree:
         parent: The parent node of the current node.
         children: The list of child nodes of the current node.
     """
+    __slots__ = 'value', 'children', 'parent'
 
     def __init__(self, value, parent=None):
         """
@@ -574,7 +620,9 @@ class Namespace(Tree):
         nodes: The list of nodes in the namespace.
         prepend: The string to prepend to the namespace name.
     """
-    def __init__(self, name, nodes=[], prepend=None, parent=None):
+    __slots__ = 'name', 'nodes', 'prepend', 'child_names'
+
+    def __init__(self, name, nodes=None, prepend=None, parent=None):
         """
         Initializes a new instance of the Namespace class.
 
@@ -584,7 +632,7 @@ class Namespace(Tree):
             prepend: The string to prepend to the namespace name.
         """
         self.name = name
-        self.nodes = nodes
+        self.nodes = [] if nodes is None else nodes
         self.prepend = prepend
         if prepend is None:
             self.prepend = name
@@ -592,7 +640,7 @@ class Namespace(Tree):
         self.parent = parent
         self.child_names = set()
 
-    def add_child(self, name, nodes=[], prepend=None):
+    def add_child(self, name, nodes=None, prepend=None):
         """
         Adds a child namespace to the current namespace.
 
@@ -1,5 +1,8 @@
 from typing import Union
 from csdl_alpha.src.graph.node import Node
+import numpy as np
+
+_INT_TYPES = (int, np.integer)
 
 def get_check_shape_mismatch_string(a, b, a_str = None, b_str = None):
     """
@@ -17,20 +20,16 @@ def get_node_name_string(nodes:Union[list[Node], Node]):
     """
     if isinstance(nodes, Node):
         return nodes.name
-    nodes_str = ""
-    for node in nodes:
-        nodes_str += f"{node.name}, "
-    nodes_str = nodes_str[:-2]
-    return nodes_str
+    return ", ".join(f"{node.name}" for node in nodes)
 
 def check_if_valid_shape(shape):
     """
     checks if shape is a tuple of integers and raises TypeError otherwise
     """
-    if not isinstance(shape, tuple):
+    # NOTE: results can't be memoized on the shape as (1.0,) == (1,) with the same hash
+    if type(shape) is not tuple and not isinstance(shape, tuple):
         raise TypeError(f"shape must be a tuple. {type(shape)} given.")
     for dim in shape:
-        import numpy as np
-        if not isinstance(dim, (int, np.integer)):
+        if type(dim) is not int and not isinstance(dim, _INT_TYPES):
             raise TypeError(f"shape must consist of integers. {type(dim)} given.")
     return True
@@ -11,4 +11,12 @@ def hard_reload():
     from csdl_alpha.manager import RecManager
     RecManager.instantiated = False
     import csdl_alpha.api
-    reload(csdl_alpha.api)
\ No newline at end of file
+    reload(csdl_alpha.api)
+
+
+def reset_recorders():
+    """
+    clears all recorders from the manager instance without re-importing any modules.
+    """
+    from csdl_alpha.api import manager
+    manager.reset()
@@ -5,7 +5,19 @@ def get_type_string(obj)-> str:
     return f'\'{type(obj).__name__}\''
 
 def ingest_value(value, dtype=np.float64):
-    if isinstance(value, (float, int, np.integer, np.floating)):
+    # exact type checks for the common cases before the general isinstance checks
+    value_type = type(value)
+    if value_type is np.ndarray:
+        if value.dtype != dtype:
+            value = value.astype(dtype)
+    elif value_type is float or value_type is int:
+        # filling an empty array skips np.array's list and dtype inference
+        scalar = value
+        value = np.empty(1, dtype=dtype)
+        value[0] = scalar
+    elif value is None:
+        pass
+    elif isinstance(value, (float, int, np.integer, np.floating)):
         value = np.array([value], dtype=dtype)
     elif isinstance(value, np.ndarray):
 
@@ -14,11 +26,14 @@ def ingest_value(value, dtype=np.float64):
 
         if value.dtype != dtype:
             value = value.astype(dtype)
-    elif value is not None:
+    else:
         raise TypeError(f"Value must be a numpy array, float or int. Type {get_type_string(value)} given")
     return value
 
 def scalarize(value):
+    value_type = type(value)
+    if value_type is float or value_type is int:
+        return value
     if isinstance(value, np.ndarray):
         if value.size == 1:
             return value[0]
@@ -32,20 +47,28 @@ def scalarize(value):
 
 def process_shape_and_value(shape, value, dtype=np.float64):
     value = ingest_value(value, dtype=dtype)
-    if shape is not None:
-        check_if_valid_shape(shape)
-        if value is not None and shape != value.shape:
-            if value.shape == (1,):
-                value = value[0]*np.ones(shape)
-            else:
-                raise ValueError(f"Shape and value shape must match. Shape {shape} given but value has shape {value.shape}")
-    elif value is None:
-        raise ValueError("Shape or value must be provided")
-    else:
-        shape = value.shape
+    if shape is None:
+        # the shape comes from the (already validated) value
+        if value is None:
+            raise ValueError("Shape or value must be provided")
+        return value.shape, value
+
+    check_if_valid_shape(shape)
+    if value is not None and shape != value.shape:
+        if value.shape == (1,):
+            value = value[0]*np.ones(shape)
+        else:
+            raise ValueError(f"Shape and value shape must match. Shape {shape} given but value has shape {value.shape}")
     return shape, value
 
 
+# the variable module imports this one, so its classes are only bound on first use
+_graph_classes = None
+
+def _load_graph_classes():
+    global _graph_classes
+    import csdl_alpha.src.graph.variable as _graph_classes
+
 def validate_and_variablize(value, raise_on_sparse = True):
     """Must be called on all variables that are inputs to operations
 
@@ -67,30 +90,39 @@ def validate_and_variablize(value, raise_on_sparse = True):
         _description_
     """
 
+    # plain variables (most operation inputs) need no checks
+    if _graph_classes is None:
+        _load_graph_classes()
+    if type(value) is _graph_classes.Variable:
+        return value
+
     var = variablize(value)
 
-    from csdl_alpha.src.graph.variable import SparseMatrix
-    if isinstance(var, SparseMatrix):
+    if isinstance(var, _graph_classes.SparseMatrix):
         if raise_on_sparse:
             raise TypeError("Sparse matrices not supported for this value.")
     return var
 
 def variablize(variable):
-    from csdl_alpha.src.graph.variable import Variable, Constant
-    if isinstance(variable, Variable):
+    if _graph_classes is None:
+        _load_graph_classes()
+    Variable = _graph_classes.Variable
+    if type(variable) is Variable or isinstance(variable, Variable):
         return variable
     if variable is None:
         raise ValueError("Variable/Value must not be None")
+    variable_type = type(variable)
+    if variable_type is float or variable_type is int:
+        return _graph_classes.Constant.from_scalar(variable)
     else:
-        var = Constant(value = ingest_value(variable))
+        var = _graph_classes.Constant(value = ingest_value(variable))
         return var
 
 def get_shape(shape, value):
     if shape is None:
         if value is not None:
-            shape = value.shape
-        else:
-            raise ValueError("Shape or value must be provided")
+            return value.shape
+        raise ValueError("Shape or value must be provided")
     else:
         check_if_valid_shape(shape)
         if value is not None:
@@ -1,15 +1,26 @@
 import numpy as np
+from numpy.testing import assert_array_almost_equal
+import doctest
+
+_DOCTEST_FINDER = doctest.DocTestFinder()
 
 class CSDLTest():
 
-    def prep(self, inline = True, **kwargs):
+    def prep(self, inline = True, hard = False, **kwargs):
         """
         preprocessing for running tests to check csdl computations.
 
+        Existing recorders are cleared from the manager. hard = True resets the manager
+        by reloading the api module instead, which is only needed if the manager itself is corrupted.
+
         kwargs are passed to the recorder constructor.
         """
-        from csdl_alpha.utils.hard_reload import hard_reload
-        hard_reload()
+        if hard:
+            from csdl_alpha.utils.hard_reload import hard_reload
+            hard_reload()
+        else:
+            from csdl_alpha.utils.hard_reload import reset_recorders
+            reset_recorders()
 
         kwargs['inline'] = inline
         import csdl_alpha as csdl
@@ -25,9 +36,16 @@ class CSDLTest():
             step_size = 1e-6,
             ignore_constants = False,
             turn_off_recorder = True,
+            double_execute = True,
         ):
+        """
+        Compares values and derivatives of csdl variables with expected values.
+
+        double_execute re-runs the recorded graph at the end to make sure it can be
+        executed more than once. The test suite keeps the default (True); set it to False
+        to skip the extra run when iterating locally on large graphs.
+        """
         import csdl_alpha as csdl
-        import numpy as np
         recorder = csdl.get_current_recorder()
         if turn_off_recorder:
             recorder.stop()
@@ -37,11 +55,8 @@ class CSDLTest():
         if compare_derivatives is None:
             compare_derivatives = []
 
-        from numpy.testing import assert_array_equal
-
         # TODO: make compatible with sparse variables
-        for ind, testing_pair in enumerate(compare_values):
-            testing_pair.compare(ind+1)
+        compare_testing_pairs(compare_values)
         
         # Add derivatives to the graph and verify with finite difference if needed. Recorder needs to be re-started
         if verify_derivatives:
@@ -52,41 +67,34 @@ class CSDLTest():
             from csdl_alpha.src.operations.derivative.utils import verify_derivatives_inline
             
             graph_insights = recorder.gather_insights()
-            wrts_all = list(graph_insights['input_nodes'])
-            wrts = []
-            j = 0
-            for i, wrt in enumerate(wrts_all):
-                from csdl_alpha.src.graph.variable import Constant
-                # TODO: Find a deterministic way to skip certain constants
-                # if isinstance(wrt, Constant):
-                #     # check if i is even:
-                #     j+=1
-                #     if (j) % 3 == 0:
-                #         continue
-                if ignore_constants and isinstance(wrt, Constant):
-                    continue
-                wrts.append(wrt)
+            # TODO: Find a deterministic way to skip certain constants
+            if ignore_constants:
+                wrts = list(graph_insights['input_nodes_nonconst'])
+            else:
+                wrts = list(graph_insights['input_nodes'])
             ofs = [testing_pair.csdl_variable for testing_pair in compare_values]
             of_wrt_meta_data = {}
             for testing_pair in compare_values:
+                of = testing_pair.csdl_variable
                 tag = testing_pair.tag
                 if tag is None:
                     tag = ''
                 rel_error = 10**(-testing_pair.decimal)
-                for wrt in wrts:
-                    if (wrt in ignore_derivative_fd_error) or (testing_pair.csdl_variable in ignore_derivative_fd_error):
-                        rel_error = 2.0
-                    of_wrt_meta_data[(testing_pair.csdl_variable, wrt)] = {
+                of_ignored = of in ignore_derivative_fd_error
+                of_wrt_meta_data.update({
+                    (of, wrt): {
                         'tag': tag,
-                        'max_rel_error': rel_error,   
-                    }
+                        'max_rel_error': 2.0 if (of_ignored or wrt in ignore_derivative_fd_error) else rel_error,
+                    } for wrt in wrts
+                })
             
             verify_derivatives_inline(ofs, wrts, step_size, of_wrt_meta_data = of_wrt_meta_data)
 
             recorder.stop()
 
         # run the graph again to make sure it actually runs twice.
-        recorder.execute()
+        if double_execute:
+            recorder.execute()
         # recorder.print_graph_structure()
         # recorder.visualize_graph()
 
@@ -101,16 +109,13 @@ class CSDLTest():
         #     optionflags=doctest.FAIL_FAST,
         # )
         self.prep()
-        import doctest
         import csdl_alpha as csdl
-        import numpy as np
 
-        # Create a new instance of a DocTestFinder and DocTestRunner class
-        finder = doctest.DocTestFinder()
+        # The finder holds no per-call state and is shared. The runner counts failures so a new one is needed
         runner = doctest.DocTestRunner(verbose=False)
 
         # Find the tests
-        tests = finder.find(obj, globs={'csdl': csdl, 'np': np})
+        tests = _DOCTEST_FINDER.find(obj, globs={'csdl': csdl, 'np': np})
 
         # Run the tests
         for test in tests:
@@ -123,6 +128,37 @@ class CSDLTest():
 def get_testing_error_string(error_string):
     return f"Test implementation error: {error_string}"
 
+def compare_testing_pairs(testing_pairs):
+    """
+    Compares a list of testing pairs with one vectorized check per tolerance.
+
+    If any shape does not match or any batched value check fails, every pair is compared
+    individually in order so the reported error is the same as comparing them one by one.
+    """
+    groups = {}
+    for testing_pair in testing_pairs:
+        if testing_pair.csdl_variable.shape != testing_pair.real_value.shape:
+            break
+        groups.setdefault(testing_pair.decimal, []).append(testing_pair)
+    else:
+        if all(_values_almost_equal(group, decimal) for decimal, group in groups.items()):
+            return
+
+    for ind, testing_pair in enumerate(testing_pairs):
+        testing_pair.compare(ind+1)
+
+def _values_almost_equal(testing_pairs, decimal)->bool:
+    """
+    checks the values of testing pairs of matching shapes all at once
+    with the same criterion as assert_array_almost_equal (NaNs are reported as not equal)
+    """
+    try:
+        actual = np.concatenate([np.ravel(pair.csdl_variable.value) for pair in testing_pairs])
+        desired = np.concatenate([np.ravel(pair.real_value) for pair in testing_pairs])
+        return bool(np.all(np.abs(desired - actual) < 1.5 * 10.0**(-decimal)))
+    except (TypeError, ValueError):
+        return False
+
 class TestingPair():
     from csdl_alpha.src.graph.variable import Variable
 
@@ -141,10 +177,10 @@ class TestingPair():
             decimal (int): decimal places for tolerance
             tag (str): tag for the pair
         """
-        from csdl_alpha.src.graph.variable import Variable
-        if not isinstance(csdl_variable, Variable):
+        # exact type checks first, isinstance only for subclasses
+        if type(csdl_variable) is not self.Variable and not isinstance(csdl_variable, self.Variable):
             raise TypeError(get_testing_error_string(f"compare_values key {csdl_variable} is not a csdl.Variable"))
-        if not isinstance(real_value, (np.ndarray)):
+        if type(real_value) is not np.ndarray and not isinstance(real_value, np.ndarray):
             raise TypeError(get_testing_error_string(f"compare_values value {real_value} is not a numpy array"))
 
         self.csdl_variable = csdl_variable
@@ -167,28 +203,35 @@ class TestingPair():
         if self.csdl_variable.shape != self.real_value.shape:
             raise AssertionError(self.get_assertion_error_string(ind, 'shape'))
 
-        from numpy.testing import assert_array_almost_equal
-        assert_array_almost_equal(
-            self.csdl_variable.value,
-            self.real_value,
-            decimal = self.decimal,
-            err_msg = self.get_assertion_error_string(ind, 'value')
-        )
+        try:
+            assert_array_almost_equal(
+                self.csdl_variable.value,
+                self.real_value,
+                decimal = self.decimal,
+            )
+        except AssertionError:
+            # the error message prints both arrays so it is only built when the comparison fails
+            assert_array_almost_equal(
+                self.csdl_variable.value,
+                self.real_value,
+                decimal = self.decimal,
+                err_msg = self.get_assertion_error_string(ind, 'value')
+            )
 
     def get_assertion_error_string(self, ind, error_type):
-        error_str = "\n"
-        error_str += f"{error_type} assertion error in\n"
-        error_str += f"Var/value pair:   \"{self.tag}\"\n"
-        error_str += f"Index in list:    {ind}\n"
-        error_str += f"Variable name:    {self.csdl_variable.name}\n"
-
         if error_type == 'value':
-            error_str += f"\nVariable value:   \n{self.csdl_variable.value}\n\n"
-            error_str += f"Real value:       \n{self.real_value}\n"
+            details = f"\nVariable value:   \n{self.csdl_variable.value}\n\nReal value:       \n{self.real_value}\n"
         elif error_type == 'shape':
-            error_str += f"\nVariable shape:   {self.csdl_variable.shape}\n"
-            error_str += f"Real shape:       {self.real_value.shape}\n"
-        return error_str
+            details = f"\nVariable shape:   {self.csdl_variable.shape}\nReal shape:       {self.real_value.shape}\n"
+        else:
+            details = ""
+        return (
+            f"\n{error_type} assertion error in\n"
+            f"Var/value pair:   \"{self.tag}\"\n"
+            f"Index in list:    {ind}\n"
+            f"Variable name:    {self.csdl_variable.name}\n"
+            f"{details}"
+        )
 
 # class TestingPairs():
 
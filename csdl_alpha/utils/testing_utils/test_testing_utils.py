@@ -14,6 +14,7 @@ def test_tp_wrong_val():
     tp = TestingPair(x,y)
     with pytest.raises(AssertionError) as e_info:
         tp.compare(0)
+    assert 'Var/value pair:   "x"' in str(e_info.value)
 
 def test_tp_wrong_shape():
     from csdl_alpha.utils.hard_reload import hard_reload
@@ -54,4 +55,27 @@ def test_tp_2():
     rec.start()
     x = csdl.Variable(name = 'x', value = 1.5)
     with pytest.raises(TypeError) as e_info:
-        tp = TestingPair(x,x)
\ No newline at end of file
+        tp = TestingPair(x,x)
+
+def test_tp_batched_compare():
+    from csdl_alpha.utils.hard_reload import hard_reload
+    from csdl_alpha.utils.testing_utils.csdl_test import compare_testing_pairs
+    hard_reload()
+    rec = csdl.build_new_recorder()
+    rec.start()
+    y = np.ones((5,5))*5.5
+    x1 = csdl.Variable(name = 'x1', value = y)
+    x2 = csdl.Variable(name = 'x2', value = y+1e-6)
+    x3 = csdl.Variable(name = 'x3', value = y+1e-6)
+    compare_testing_pairs([TestingPair(x1,y), TestingPair(x2,y,decimal = 5)])
+    with pytest.raises(AssertionError) as e_info:
+        compare_testing_pairs([TestingPair(x1,y), TestingPair(x2,y,decimal = 5), TestingPair(x3,y)])
+    assert 'Var/value pair:   "x3"' in str(e_info.value)
+    assert 'Index in list:    3' in str(e_info.value)
+
+    # a value error before a shape error is reported first, as when comparing pair by pair
+    x4 = csdl.Variable(name = 'x4', value = 5.5)
+    with pytest.raises(AssertionError) as e_info:
+        compare_testing_pairs([TestingPair(x1,y), TestingPair(x3,y), TestingPair(x4,y)])
+    assert 'value assertion error' in str(e_info.value)
+    assert 'Var/value pair:   "x3"' in str(e_info.value)
@@ -24,6 +24,11 @@ if __name__ == '__main__':
 
     print(z.value) # should be 
 
+    # the same sum recorded as a single elementwise_sum operation
+    z0 = csdl.Variable(name = 'z0', value = 2.0)
+    z_sum = csdl.sum(z0, *[x]*60_000)
+    print(z_sum.value) # should match z.value
+
     # recorder.active_graph.visualize()
     # recorder.active_graph.visualize_n2()
 
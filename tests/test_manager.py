@@ -79,4 +79,30 @@ def test_manager_information():
     recorder.stop()
     assert len(manager.constructed_recorders) == 2 # two recorders still
     assert len(manager.recorder_stack) ==0  # No recorders active now
-    assert manager.active_recorder is None  # No recorders active now
\ No newline at end of file
+    assert manager.active_recorder is None  # No recorders active now
+
+def test_reset_recorders():
+    """
+    reset_recorders clears all recorders but keeps the same manager instance
+    """
+
+    from csdl_alpha.utils.hard_reload import hard_reload, reset_recorders
+    hard_reload()
+
+    import csdl_alpha as csdl
+    from csdl_alpha.api import manager
+
+    recorder = csdl.build_new_recorder()
+    recorder.start()
+    reset_recorders()
+
+    from csdl_alpha.api import manager as manager2
+    assert manager2 is manager
+    assert manager.active_recorder is None
+    assert len(manager.constructed_recorders) == 0
+    assert len(manager.recorder_stack) == 0
+
+    recorder2 = csdl.build_new_recorder()
+    recorder2.start()
+    assert csdl.get_current_recorder() == recorder2
+    assert len(manager.constructed_recorders) == 1
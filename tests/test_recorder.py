@@ -68,6 +68,11 @@ def test_namespacing():
     assert c.namespace.prepend == 'test1.test2'
     assert len(recorder.active_graph.node_table) == 3
 
+    # each namespace only holds its own nodes
+    assert a.namespace.nodes == [a]
+    assert b.namespace.nodes == [b]
+    assert c.namespace.nodes == [c]
+
 def test_duplicate_namespace_error():
     import csdl_alpha as csdl
     from csdl_alpha.src.graph.variable import Variable